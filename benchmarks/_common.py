@@ -0,0 +1,14 @@
+# Setup shared by the benchmark scripts, imported before anything from lang: makes the
+# repository importable however a script is started, runs the same runtime init as
+# radon.py, and silences the warnings about optional dependencies (fishhook, numpy),
+# which aren't what's being measured.
+import os
+import sys
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+warnings.simplefilter("ignore", RuntimeWarning)
+
+import lang.runtime
+
+lang.runtime.init()
@@ -0,0 +1,63 @@
+# Compile throughput (parse + translate + compile) with a growing number of threads.
+# Only scales on free-threaded CPython; with the GIL it mostly shows the overhead stays flat.
+import ast
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import _common
+from lang.bootstrap import COMPILE_FLAGS
+from lang.parser import Parser
+from lang.translator import Translator
+
+SOURCE = """
+fn scale_{tag}(xs, k)
+    xs |>> map(lambda(x) x * k + {i}; end) |>> list();
+end
+fn labels_{tag}(xs)
+    [f"item {{x}} of {i}" for x in xs if x % 3 != 0];
+end
+fn table_{tag}(n)
+    {{str(i): i * i for i in range(n)}};
+end
+class Point_{tag}
+    fn __init__(self, x, y)
+        self.x = x;
+        self.y = y;
+    end
+    fn norm2(self)
+        self.x * self.x + self.y * self.y;
+    end
+end
+"""
+
+MODULES = 200
+FNS_PER_MODULE = 10
+
+def tag(n: int):
+    # identifiers can't contain every digit, so number the generated names with letters
+    return "".join(chr(ord("a") + int(d)) for d in str(n))
+
+def compile_source(source: str):
+    return compile(Translator().run(Parser(source).run()), "<compile_threads>", "exec", flags=COMPILE_FLAGS)
+
+if __name__ == "__main__":
+    sources = ["".join(SOURCE.format(i=m * FNS_PER_MODULE + i, tag=tag(m * FNS_PER_MODULE + i)) for i in range(FNS_PER_MODULE)) for m in range(MODULES)]
+    # translating the same source on many threads at once must give the same result as doing it alone
+    expected = ast.dump(Translator().run(Parser(sources[0]).run()))
+    with ThreadPoolExecutor(8) as pool:
+        assert all(ast.dump(t) == expected for t in pool.map(lambda s: Translator().run(Parser(s).run()), [sources[0]] * 32))
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"{MODULES} modules, GIL {'enabled' if gil else 'disabled'}")
+    baseline = None
+    for threads in (1, 2, 4, 8, 16):
+        if threads > (os.cpu_count() or 1) * 2:
+            break
+        with ThreadPoolExecutor(threads) as pool:
+            start = time.perf_counter()
+            list(pool.map(compile_source, sources))
+            elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{threads:3} thread(s): {MODULES / elapsed:8.1f} modules/s  {baseline / elapsed:5.2f}x")
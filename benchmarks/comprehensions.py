@@ -0,0 +1,42 @@
+# List comprehensions vs the foreach + append and map + lambda idioms.
+import timeit
+
+import _common
+from lang.runtime import import_module_from_radon_string
+
+SOURCE = """
+fn with_comprehension(xs)
+    [x * 2 + 1 for x in xs if x % 3 != 0];
+end
+fn with_foreach(xs)
+    out = [];
+    xs.foreach(lambda(x)
+        if x % 3 != 0 then
+            out.append(x * 2 + 1);
+        end
+    end);
+    out;
+end
+fn with_map(xs)
+    list(map(lambda(x) x * 2 + 1; end, filter(lambda(x) x % 3 != 0; end, xs)));
+end
+"""
+
+N = 100_000
+
+if __name__ == "__main__":
+    module = import_module_from_radon_string("comprehension_benchmark", SOURCE, "<comprehension_benchmark>")
+    xs = list(range(N))
+    expected = module.with_comprehension(xs)
+
+    results = {}
+    for name in ("with_comprehension", "with_foreach", "with_map"):
+        fn = getattr(module, name)
+        try:
+            assert fn(xs) == expected
+        except AttributeError:
+            print(f"{name:20} skipped (foreach needs fishhook)")
+            continue
+        results[name] = min(timeit.repeat(lambda: fn(xs), number=1, repeat=5))
+    for name, t in results.items():
+        print(f"{name:20} {t * 1000:8.1f} ms  {t / results['with_comprehension']:5.2f}x")
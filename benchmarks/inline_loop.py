@@ -0,0 +1,30 @@
+# Tight numeric loop calling a small helper, with and without @inline.
+import timeit
+
+import _common
+from lang.runtime import import_module_from_radon_string
+
+SOURCE = """
+fn sq(x) {attr}
+    x * x;
+end
+fn norm2(x, y) {attr}
+    sq(x) + sq(y);
+end
+fn kernel(n)
+    sum(map(lambda(i) norm2(i, i + 1) % 7; end, range(n)));
+end
+"""
+
+N = 200_000
+
+if __name__ == "__main__":
+    plain = import_module_from_radon_string("inline_benchmark_plain", SOURCE.format(attr=""), "<inline_benchmark_plain>")
+    inlined = import_module_from_radon_string("inline_benchmark_inlined", SOURCE.format(attr="@inline"), "<inline_benchmark_inlined>")
+    assert plain.kernel(1000) == inlined.kernel(1000)
+
+    t_plain = min(timeit.repeat(lambda: plain.kernel(N), number=1, repeat=5))
+    t_inlined = min(timeit.repeat(lambda: inlined.kernel(N), number=1, repeat=5))
+    print(f"plain calls: {t_plain * 1000:8.1f} ms")
+    print(f"@inline:     {t_inlined * 1000:8.1f} ms")
+    print(f"speedup:     {t_plain / t_inlined:8.2f}x")
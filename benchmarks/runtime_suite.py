@@ -0,0 +1,190 @@
+# Runtime cost of Radon's translation strategy, measured against the Python
+# you'd write by hand for the same program. Compile time is not included.
+# Usage: python benchmarks/runtime_suite.py [case ...]
+import sys
+import timeit
+import types
+
+import _common
+from lang.runtime import import_module_from_radon_string
+
+# name: (construct being measured, radon source, python source, entry, args)
+CASES = {
+    "numeric_lambda": (
+        "lambda hoisting into preinit_statements",
+        """
+fn kernel(n)
+    sum(map(lambda(i)
+        j = i * i;
+        j % 7 + j % 3;
+    end, range(n)));
+end
+""",
+        """
+def kernel(n):
+    def step(i):
+        j = i * i
+        return j % 7 + j % 3
+    return sum(map(step, range(n)))
+""",
+        "kernel", lambda: (200_000,),
+    ),
+    "string_foreach": (
+        "fishhook foreach",
+        """
+fn kernel(words)
+    out = [];
+    words.foreach(lambda(w) out.append(w.upper()); end);
+    "".join(out);
+end
+""",
+        """
+def kernel(words):
+    out = []
+    for w in words:
+        out.append(w.upper())
+    return "".join(out)
+""",
+        "kernel", lambda: ([f"w{i}" for i in range(100_000)],),
+    ),
+    "string_pipes": (
+        "NodePipe argument insertion",
+        """
+fn kernel(n)
+    range(n) |>> map(str) |>> filter(str.isdigit) |>> "-".join() |> len();
+end
+""",
+        """
+def kernel(n):
+    return len("-".join(filter(str.isdigit, map(str, range(n)))))
+""",
+        "kernel", lambda: (200_000,),
+    ),
+    "implicit_return": (
+        "implicit return of the last expression",
+        """
+fn mix(a, b)
+    c = a * 31 + b;
+    c % 1000003;
+end
+fn kernel(n)
+    sum([mix(i, i + 1) for i in range(n)]);
+end
+""",
+        """
+def mix(a, b):
+    c = a * 31 + b
+    return c % 1000003
+def kernel(n):
+    return sum([mix(i, i + 1) for i in range(n)])
+""",
+        "kernel", lambda: (200_000,),
+    ),
+    "async_fanout": (
+        "async fn / await",
+        """
+import asyncio;
+fn work(i) @async
+    await asyncio.sleep(0);
+    i * 2;
+end
+fn fan(n) @async
+    tasks = [asyncio.create_task(work(i)) for i in range(n)];
+    sum([await t for t in tasks]);
+end
+fn kernel(n)
+    asyncio.run(fan(n));
+end
+""",
+        """
+import asyncio
+async def work(i):
+    await asyncio.sleep(0)
+    return i * 2
+async def fan(n):
+    tasks = [asyncio.create_task(work(i)) for i in range(n)]
+    return sum([await t for t in tasks])
+def kernel(n):
+    return asyncio.run(fan(n))
+""",
+        "kernel", lambda: (10_000,),
+    ),
+    "class_heavy": (
+        "class bodies and method calls",
+        """
+class Vec
+    fn __init__(self, x, y)
+        self.x = x;
+        self.y = y;
+    end
+    fn add(self, o)
+        Vec(self.x + o.x, self.y + o.y);
+    end
+    fn dot(self, o)
+        self.x * o.x + self.y * o.y;
+    end
+end
+fn kernel(n)
+    acc = Vec(0, 0);
+    unit = Vec(1, 2);
+    sum([acc.add(Vec(i, i)).dot(unit) for i in range(n)]);
+end
+""",
+        """
+class Vec:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+    def add(self, o):
+        return Vec(self.x + o.x, self.y + o.y)
+    def dot(self, o):
+        return self.x * o.x + self.y * o.y
+def kernel(n):
+    acc = Vec(0, 0)
+    unit = Vec(1, 2)
+    return sum([acc.add(Vec(i, i)).dot(unit) for i in range(n)])
+""",
+        "kernel", lambda: (100_000,),
+    ),
+}
+
+def bytecode_size(code: types.CodeType):
+    "Size of a module's bytecode, including every nested function, lambda and class body"
+    return len(code.co_code) + sum(bytecode_size(c) for c in code.co_consts if isinstance(c, types.CodeType))
+
+def load_python(name: str, source: str):
+    module = types.ModuleType(name)
+    code = compile(source, f"<{name}>", "exec")
+    exec(code, module.__dict__)
+    return module, code
+
+def load_radon(name: str, source: str):
+    module = import_module_from_radon_string(name, source, f"<{name}>")
+    # import_module_from_radon_string doesn't hand back the code object, so
+    # recompile the same source the same way to measure it
+    from lang.parser import Parser
+    from lang.translator import Translator
+    code = compile(Translator().run(Parser(source).run()), f"<{name}>", "exec")
+    return module, code
+
+def bench(fn, args, repeat: int = 7):
+    return min(timeit.repeat(lambda: fn(*args), number=1, repeat=repeat))
+
+if __name__ == "__main__":
+    selected = sys.argv[1:] or list(CASES)
+    print(f"{'case':18} {'construct':42} {'radon':>10} {'python':>10} {'ratio':>6} {'bytecode':>16}")
+    for name in selected:
+        construct, radon_source, python_source, entry, make_args = CASES[name]
+        radon_module, radon_code = load_radon(f"runtime_suite_{name}_radon", radon_source)
+        python_module, python_code = load_python(f"runtime_suite_{name}_python", python_source)
+        args = make_args()
+        try:
+            assert getattr(radon_module, entry)(*args) == getattr(python_module, entry)(*args), name
+        except AttributeError:
+            print(f"{name:18} {construct:42} skipped (foreach needs fishhook)")
+            continue
+        t_radon = bench(getattr(radon_module, entry), args)
+        t_python = bench(getattr(python_module, entry), args)
+        size_radon, size_python = bytecode_size(radon_code), bytecode_size(python_code)
+        print(f"{name:18} {construct:42} {t_radon * 1000:8.1f}ms {t_python * 1000:8.1f}ms "
+              f"{t_radon / t_python:5.2f}x {size_radon:6}B {size_radon - size_python:+6}B")
@@ -0,0 +1,40 @@
+# Per-instance memory of a plain Radon class vs the same class marked @slots.
+import tracemalloc
+
+import _common
+from lang.runtime import import_module_from_radon_string
+
+SOURCE = """
+class Plain
+    fn __init__(self, x, y, z)
+        self.x = x;
+        self.y = y;
+        self.z = z;
+    end
+end
+class Slotted @slots
+    x = 0;
+    y = 0;
+    z = 0;
+end
+"""
+
+N = 200_000
+
+def measure(cls):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [cls(i, i, i) for i in range(N)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    # subtract the list holding the instances
+    return (after - before) / N - 8
+
+if __name__ == "__main__":
+    module = import_module_from_radon_string("slots_benchmark", SOURCE, "<slots_benchmark>")
+    plain = measure(module.Plain)
+    slotted = measure(module.Slotted)
+    print(f"plain:   {plain:7.1f} bytes/instance")
+    print(f"@slots:  {slotted:7.1f} bytes/instance")
+    print(f"saved:   {plain - slotted:7.1f} bytes/instance ({1 - slotted / plain:.0%})")
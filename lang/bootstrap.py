@@ -0,0 +1,180 @@
+# Parser-free part of the runtime. Everything in here must be importable
+# without lang.parser / lang.translator, since it's shipped inside bundles.
+import ast
+import asyncio
+import atexit
+import contextvars
+import functools
+import importlib
+import importlib.util
+import inspect
+import marshal
+import sys
+import threading
+import zipfile
+
+BUNDLE_MAGIC = importlib.util.MAGIC_NUMBER
+
+# every Radon module is compiled with this, so `await` works at the top level
+COMPILE_FLAGS = ast.PyCF_ALLOW_TOP_LEVEL_AWAIT
+
+# The shared loop is process-wide but, like any asyncio loop, can only be driven from one thread:
+# the one that created it. Top-level await in a module imported from another thread is an error.
+_loop_factory = asyncio.new_event_loop
+_loop = None
+_loop_thread = None
+_loop_lock = threading.Lock()
+
+def set_loop_factory(factory):
+    "Sets the callable used to create the shared event loop, e.g. uvloop.new_event_loop"
+    global _loop_factory
+    if _loop is not None:
+        raise RuntimeError("the Radon event loop has already been created")
+    _loop_factory = factory
+
+def get_loop():
+    "Returns the event loop shared by every module with top-level await, creating it on first use"
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = _loop_factory()
+            _loop_thread = threading.get_ident()
+            asyncio.set_event_loop(_loop)
+            atexit.register(close_loop)
+        elif _loop_thread != threading.get_ident():
+            raise RuntimeError("the Radon event loop belongs to another thread, so modules with top-level await can only be run from the thread that ran the first one")
+        return _loop
+
+def close_loop():
+    global _loop
+    if _loop is not None and not _loop.is_closed():
+        _loop.run_until_complete(_loop.shutdown_asyncgens())
+        _loop.close()
+    _loop = None
+
+# set while an awaited import is running, so modules with top-level await are
+# handed back to it to be awaited instead of blocking on the (running) loop
+_deferred = contextvars.ContextVar("_radon_deferred", default=None)
+
+def run_code(code, namespace: dict):
+    "Runs compiled Radon code; code that awaits at the top level is driven to completion on the shared loop"
+    if not code.co_flags & inspect.CO_COROUTINE:
+        token = _deferred.set(None)
+        try:
+            return eval(code, namespace)
+        finally:
+            _deferred.reset(token)
+    deferred = _deferred.get()
+    if deferred is not None:
+        deferred.append(eval(code, namespace))
+        return None
+    loop = get_loop()
+    if loop.is_running():
+        raise RuntimeError(f"{code.co_filename} uses top-level await, so it can't be imported from a non-async fn while the event loop is running")
+    return loop.run_until_complete(eval(code, namespace))
+
+async def import_async(importer, names: list[str], as_name: str):
+    "What imports compile to in async fns and in modules that await at the top level"
+    deferred = []
+    token = _deferred.set(deferred)
+    try:
+        module = importer(names, as_name)
+    finally:
+        _deferred.reset(token)
+    for body in deferred:
+        await body
+    return module
+
+def init():
+    try:
+        import fishhook
+        def foreach(self, func):
+            for i in self:
+                func(i)
+        def foreach_dict(self, func):
+            for pair in self.items():
+                func(*pair)
+        
+        fishhook.hook(list)(foreach)
+        fishhook.hook(tuple)(foreach)
+        fishhook.hook(set)(foreach)
+        fishhook.hook(dict, name="foreach")(foreach_dict)
+    except ImportError as e:
+        if e.name != "fishhook":
+            raise e from None
+        import warnings
+        warnings.warn(RuntimeWarning("Could not import fishhook. Some standard features will not be available."))
+
+class LazyModule:
+    def __init__(self, importer, names: list[str], as_name: str):
+        object.__setattr__(self, "_radon_lazy_importer", importer)
+        object.__setattr__(self, "_radon_lazy_names", names)
+        object.__setattr__(self, "_radon_lazy_as_name", as_name)
+        object.__setattr__(self, "_radon_lazy_module", None)
+        # held while the module loads, so threads touching it at once run its body only once
+        object.__setattr__(self, "_radon_lazy_lock", threading.RLock())
+
+    def _radon_resolve(self):
+        module = object.__getattribute__(self, "_radon_lazy_module")
+        if module is None:
+            with object.__getattribute__(self, "_radon_lazy_lock"):
+                module = object.__getattribute__(self, "_radon_lazy_module")
+                if module is None:
+                    importer = object.__getattribute__(self, "_radon_lazy_importer")
+                    module = importer(object.__getattribute__(self, "_radon_lazy_names"), object.__getattribute__(self, "_radon_lazy_as_name"))
+                    object.__setattr__(self, "_radon_lazy_module", module)
+        return module
+
+    def __getattr__(self, name):
+        return getattr(self._radon_resolve(), name)
+    def __setattr__(self, name, value):
+        setattr(self._radon_resolve(), name, value)
+    def __delattr__(self, name):
+        delattr(self._radon_resolve(), name)
+    def __dir__(self):
+        return dir(self._radon_resolve())
+    def __repr__(self):
+        module = object.__getattribute__(self, "_radon_lazy_module")
+        if module is None:
+            return f"<lazy module {'.'.join(object.__getattribute__(self, '_radon_lazy_names'))!r} (not loaded)>"
+        return repr(module)
+
+class Bundle:
+    def __init__(self, path: str):
+        self.archive = zipfile.ZipFile(path)
+        if self.archive.read("radon/MAGIC") != BUNDLE_MAGIC:
+            raise ImportError("bundle was built for a different Python version")
+        self.modules = {name[len("radon/modules/"):-len(".radc")] for name in self.archive.namelist() if name.startswith("radon/modules/")}
+
+    def load_code(self, name: str):
+        return marshal.loads(self.archive.read(f"radon/modules/{name}.radc"))
+
+    def install(self, namespace: dict):
+        namespace["_global_radon_se_import"] = self.import_module
+        namespace["_global_radon_se_import_lazy"] = self.import_module_lazy
+        namespace["_global_radon_se_import_async"] = functools.partial(import_async, self.import_module)
+
+    def import_module(self, names: list[str], as_name: str):
+        if as_name is None:
+            as_name = ".".join(names)
+        name = ".".join(names)
+        if name not in self.modules:
+            return importlib.import_module(name, package=None)
+        spec = importlib.util.spec_from_loader(as_name, loader=None)
+        module = importlib.util.module_from_spec(spec)
+        self.install(module.__dict__)
+        sys.modules[as_name] = module
+        run_code(self.load_code(name), module.__dict__)
+        return module
+
+    def import_module_lazy(self, names: list[str], as_name: str):
+        return LazyModule(self.import_module, names, as_name)
+
+    def run_main(self):
+        namespace = {"__name__": "__main__", "__builtins__": __builtins__}
+        self.install(namespace)
+        run_code(self.load_code("__main__"), namespace)
+
+def run_bundle(path: str):
+    init()
+    Bundle(path).run_main()
@@ -0,0 +1,61 @@
+import os
+import marshal
+import zipfile
+from lang.parser import Parser
+from lang.translator import Translator
+from lang.bootstrap import BUNDLE_MAGIC, COMPILE_FLAGS
+from lang.errors import RadonSyntaxError
+from lang.nodes import Node, NodeImportRadon, walk
+
+# parser-free runtime modules shipped inside every bundle
+BUNDLED_RUNTIME = ["bootstrap.py", "xml.py", "vector.py"]
+
+BUNDLE_MAIN = """import os
+from lang.bootstrap import run_bundle
+run_bundle(os.path.dirname(__file__))
+"""
+
+def compile_radon_file(filename: str):
+    source = open(filename).read()
+    try:
+        ast = Parser(source).run()
+        return ast, compile(Translator().run(ast), filename, "exec", flags=COMPILE_FLAGS)
+    except RadonSyntaxError as e:
+        raise e.set_filename(filename) from None
+
+def find_imports(ast: list[Node]):
+    for node in walk(ast):
+        if isinstance(node, NodeImportRadon):
+            yield node.what
+
+def collect_modules(entry: str):
+    "Compiles the entry file and every .rad module it (transitively) imports"
+    modules = {}
+    queue = [("__main__", entry)]
+    while queue:
+        name, filename = queue.pop()
+        if name in modules:
+            continue
+        ast, code = compile_radon_file(filename)
+        modules[name] = code
+        for names in find_imports(ast):
+            filename = "/".join(names) + ".rad"
+            # anything that's not a .rad file is left to importlib at runtime
+            if os.path.isfile(filename):
+                queue.append((".".join(names), filename))
+    return modules
+
+def build_bundle(entry: str, output: str):
+    modules = collect_modules(entry)
+    with open(output, "wb") as f:
+        f.write(b"#!/usr/bin/env python3\n")
+        with zipfile.ZipFile(f, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("__main__.py", BUNDLE_MAIN)
+            archive.writestr("lang/__init__.py", "")
+            for runtime_file in BUNDLED_RUNTIME:
+                archive.write(os.path.join(os.path.dirname(__file__), runtime_file), f"lang/{runtime_file}")
+            archive.writestr("radon/MAGIC", BUNDLE_MAGIC)
+            for name, code in modules.items():
+                archive.writestr(f"radon/modules/{name}.radc", marshal.dumps(code))
+    os.chmod(output, 0o755)
+    return modules
@@ -0,0 +1,14 @@
+class RadonSyntaxError(SyntaxError):
+    """
+    Raised for malformed Radon source. Unlike the asserts it replaces, this
+    survives `python -O`. When the parser recovers from several errors in one
+    run, the first one is raised and all of them are listed in `errors`.
+    """
+    def __init__(self, msg: str, lineno: int | None, offset: int | None, filename: str | None = None):
+        super().__init__(msg, (filename, lineno, offset, None))
+        self.errors = [self]
+
+    def set_filename(self, filename: str):
+        for error in self.errors:
+            error.filename = filename
+        return self
@@ -1,5 +1,6 @@
 from typing import Any, Literal
 import enum
+import re
 
 class Node:
     lineno: int
@@ -30,6 +31,14 @@ class BinOp(enum.Enum):
     SUB = 2
     DIV = 3
     MUL = 4
+    MOD = 5
+    BIN_AND = 6
+    BIN_OR = 7
+    BIN_XOR = 8
+
+class BoolOp(enum.Enum):
+    AND = 1
+    OR = 2
 
 class Comparator(enum.Enum):
     EQ = 5
@@ -47,6 +56,9 @@ class NodeBinOp(Node):
     left: Node
     op: BinOp
     right: Node
+class NodeBoolOp(Node):
+    op: BoolOp
+    values: list[Node]
 class NodeCompare(Node):
     left: Node
     op: BinOp
@@ -62,6 +74,25 @@ class NodeIden(Node):
 class NodeConst(Node):
     value: str | int | float
 
+class NodeFormatStr(Node):
+    values: list[Node]
+class NodeFormatValue(Node):
+    value: Node
+    conversion: str | None
+    spec: list[Node] | None
+class NodeRegex(Node):
+    pattern: str
+    flags: str
+
+# flag letters accepted after a re"..." literal, same as in Python's inline (?aiLmsux) groups
+REGEX_FLAGS = {"a": re.ASCII, "i": re.IGNORECASE, "L": re.LOCALE, "m": re.MULTILINE, "s": re.DOTALL, "u": re.UNICODE, "x": re.VERBOSE}
+
+def regex_flags(flags: str):
+    value = re.NOFLAG
+    for flag in flags:
+        value |= REGEX_FLAGS[flag]
+    return value
+
 class NodeSlice(Node):
     lower: Node
     upper: Node
@@ -109,24 +140,65 @@ class NodeAwait(Node):
 class NodeList(Node):
     values: list[Node]
     context: Literal['load'] | Literal['store']
+class NodeArray(Node):
+    value: Node
 class NodeDict(Node):
     keys: list[Node]
     values: list[Node]
 class NodeTuple(Node):
     values: list[Node]
     context: Literal['load'] | Literal['store']
+class NodeXml(Node):
+    tag: str
+    attrkeys: list[Node]
+    attrvalues: list[Node]
+    children: list[Node]
+class NodeComprehension(Node):
+    target: Node
+    iter: Node
+    ifs: list[Node]
+class NodeListComp(Node):
+    elt: Node
+    generators: list[NodeComprehension]
+class NodeSetComp(Node):
+    elt: Node
+    generators: list[NodeComprehension]
+class NodeGeneratorExp(Node):
+    elt: Node
+    generators: list[NodeComprehension]
+class NodeDictComp(Node):
+    key: Node
+    value: Node
+    generators: list[NodeComprehension]
 class NodeAssign(Node):
     targets: list[Node]
     value: Node
+class NodeConstDef(Node):
+    name: str
+    value: Node
 class NodeClassDef(Node):
     name: str
     body: list[Node]
     bases: list[Node]
+    attrs: list[Node]
     decorators: list[Node]
 
 class NodeImportRadon(Node):
     what: list[str]
     as_name: str | None
+    attrs: list[Node]
+
+def walk(node):
+    "Yields every node reachable from `node` (which may also be a list of nodes), like ast.walk"
+    if isinstance(node, (Node, FuncArg)):
+        if isinstance(node, Node):
+            yield node
+        node = list(vars(node).values())
+    elif isinstance(node, dict):
+        node = list(node.values())
+    if isinstance(node, list):
+        for child in node:
+            yield from walk(child)
 
 class FuncArg:
     pass
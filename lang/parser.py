@@ -1,6 +1,8 @@
 import string
 import enum
+import re
 from .nodes import *
+from .errors import RadonSyntaxError
 
 class TokenType(enum.Enum):
     EOF = 0
@@ -10,8 +12,11 @@ class TokenType(enum.Enum):
     INT = 3
     FLOAT = 4
     KEYWORD = 5
+    FSTR = 6
+    REGEX = 7
 
     AT = "@"
+    HASH = "#"
 
     LPAR = "("
     RPAR = ")"
@@ -62,6 +67,9 @@ class Keyword(enum.Enum):
     END = "end"
     AWAIT = "await"
     CLASS = "class"
+    FOR = "for"
+    IN = "in"
+    CONST = "const"
 
 TOKENTYPES = [i.value for i in TokenType]
 KEYWORDS = [i.value for i in Keyword]
@@ -89,9 +97,109 @@ class Lexer:
         self.ch = self.text[self.idx] if self.idx < len(self.text) else None
         if self.ch == "\n":
             self.line += 1
-            self.rel = 1
+            self.rel = 0
         return self.ch
 
+    def read_string(self, line, rel):
+        s = ""
+        quote = self.ch
+        self._next()
+        while self.ch != quote:
+            if self.ch is None:
+                raise RadonSyntaxError("unterminated string literal", line, rel)
+            s += self.ch
+            self._next()
+        self._next()
+        return s
+
+    def read_regex(self, line, rel):
+        "Reads the rest of a re\"pattern\"flags literal, starting at the opening quote"
+        pattern = ""
+        quote = self.ch
+        self._next()
+        while self.ch != quote:
+            if self.ch is None or self.ch == "\n":
+                raise RadonSyntaxError("unterminated regex literal", line, rel)
+            if self.ch == "\\":
+                self._next()
+                if self.ch is None:
+                    raise RadonSyntaxError("unterminated regex literal", line, rel)
+                # \" (or \') is how the quote is written inside the literal, every other escape belongs to the regex
+                pattern += self.ch if self.ch == quote else "\\" + self.ch
+            else:
+                pattern += self.ch
+            self._next()
+        self._next()
+        flags = ""
+        while self.ch is not None and self.ch in string.ascii_letters:
+            if self.ch not in REGEX_FLAGS:
+                raise RadonSyntaxError(f"unknown regex flag '{self.ch}'", self.line, self.rel)
+            flags += self.ch
+            self._next()
+        try:
+            re.compile(pattern, regex_flags(flags))
+        except re.error as e:
+            raise RadonSyntaxError(f"invalid regex: {e}", line, rel) from None
+        return pattern, flags
+
+    def split_fstring(self, s, line, rel):
+        """
+        Splits the body of f"..." into literal strings and (expression source, conversion, format spec)
+        tuples; the format spec is split the same way, since it may contain replacement fields too.
+        """
+        parts = [""]
+        i = 0
+        while i < len(s):
+            if s[i] in "{}" and s[i:i+2] in ("{{", "}}"):
+                parts[-1] += s[i]
+                i += 2
+            elif s[i] == "}":
+                raise RadonSyntaxError("single '}' is not allowed in f-string", line, rel)
+            elif s[i] == "{":
+                i += 1
+                start, depth, quote = i, 0, None
+                expr_end = conversion_start = spec_start = None
+                while True:
+                    if i >= len(s):
+                        raise RadonSyntaxError("expecting '}' in f-string", line, rel)
+                    c = s[i]
+                    if quote is not None:
+                        if c == quote:
+                            quote = None
+                    elif c in "\"'":
+                        quote = c
+                    elif c in "([{":
+                        depth += 1
+                    elif c in ")]}" and depth > 0:
+                        depth -= 1
+                    elif depth == 0 and spec_start is None:
+                        if c == "!" and s[i+1:i+2] != "=" and conversion_start is None:
+                            expr_end, conversion_start = i, i + 1
+                        elif c == ":":
+                            expr_end = i if expr_end is None else expr_end
+                            spec_start = i + 1
+                        elif c == "}":
+                            break
+                    elif depth == 0 and c == "}":
+                        break
+                    i += 1
+                expr_end = i if expr_end is None else expr_end
+                conversion = None
+                if conversion_start is not None:
+                    conversion = s[conversion_start:(spec_start - 1) if spec_start is not None else i].strip()
+                    if conversion not in ("r", "s", "a"):
+                        raise RadonSyntaxError(f"invalid f-string conversion '!{conversion}'", line, rel)
+                spec = self.split_fstring(s[spec_start:i], line, rel) if spec_start is not None else None
+                if s[start:expr_end].strip() == "":
+                    raise RadonSyntaxError("empty expression in f-string", line, rel)
+                parts.append((s[start:expr_end], conversion, spec))
+                parts.append("")
+                i += 1
+            else:
+                parts[-1] += s[i]
+                i += 1
+        return [part for part in parts if part != ""]
+
     def get_next(self):
         if self.ch is None:
             return Token(TokenType.EOF, -1, 0)
@@ -99,101 +207,164 @@ class Lexer:
             self._next()
             if self.ch is None:
                 return Token(TokenType.EOF, -1, 0)
+        line, rel = self.line, self.rel
         if self.ch in TOKENTYPES:
-            v = Token(TokenType(self.ch), self.line, self.rel)
+            v = Token(TokenType(self.ch), line, rel)
             self._next()
             return v
         if self.ch in "0123456789":
             n = ""
-            rel = self.rel
             while self.ch in "0123456789.":
                 n += self.ch
                 self._next()
             if "." in n:
                 try:
-                    return Token(TokenType.FLOAT, self.line, rel, float(n))
+                    return Token(TokenType.FLOAT, line, rel, float(n))
                 except ValueError:
-                    raise SyntaxError(f"Invalid float '{n}'")
-            return Token(TokenType.INT, self.line, rel, int(n))
+                    raise RadonSyntaxError(f"Invalid float '{n}'", line, rel) from None
+            return Token(TokenType.INT, line, rel, int(n))
         if self.ch in "\"'":
-            s = ""
-            rel = self.rel
-            quote = self.ch
-            self._next()
-            while self.ch != quote:
-                s += self.ch
-                self._next()
-            self._next()
-            return Token(TokenType.STR, self.line, rel, s)
+            return Token(TokenType.STR, line, rel, self.read_string(line, rel))
         if self.ch in string.ascii_letters + "_":
             i = ""
-            rel = self.rel
             while self.ch in string.ascii_letters + "_123456789":
                 i += self.ch
                 self._next()
+            if i == "f" and self.ch in "\"'":
+                return Token(TokenType.FSTR, line, rel, self.split_fstring(self.read_string(line, rel), line, rel))
+            if i == "re" and self.ch in "\"'":
+                return Token(TokenType.REGEX, line, rel, self.read_regex(line, rel))
             if i in KEYWORDS:
-                return Token(TokenType.KEYWORD, self.line, rel, Keyword(i))
-            return Token(TokenType.IDEN, self.line, rel, i)
+                return Token(TokenType.KEYWORD, line, rel, Keyword(i))
+            return Token(TokenType.IDEN, line, rel, i)
         if self.ch == "=":
             self._next()
             if self.ch == "=":
                 self._next()
-                return Token(TokenType.EQ, self.line, self.rel-2)
-            return Token(TokenType.ASSIGN, self.line, self.rel-1)
+                return Token(TokenType.EQ, line, rel)
+            return Token(TokenType.ASSIGN, line, rel)
         if self.ch == "!":
             self._next()
             if self.ch == "=":
                 self._next()
-                return Token(TokenType.NEQ, self.line, self.rel-2)
-            return Token(TokenType.NOT, self.line, self.rel-1)
+                return Token(TokenType.NEQ, line, rel)
+            return Token(TokenType.NOT, line, rel)
         if self.ch == ">":
             self._next()
             if self.ch == "=":
                 self._next()
-                return Token(TokenType.GTE, self.line, self.rel-2)
-            return Token(TokenType.GT, self.line, self.rel-1)
+                return Token(TokenType.GTE, line, rel)
+            return Token(TokenType.GT, line, rel)
         if self.ch == "-":
             self._next()
             if self.ch == "-":
                 while self.ch is not None and self.ch != "\n":
                     self._next()
                 return self.get_next()
-            return Token(TokenType.MINUS, self.line, self.rel-1)
+            return Token(TokenType.MINUS, line, rel)
         if self.ch == "<":
             self._next()
             if self.ch == "=":
                 self._next()
-                return Token(TokenType.LTE, self.line, self.rel-2)
-            return Token(TokenType.LT, self.line, self.rel-1)
+                return Token(TokenType.LTE, line, rel)
+            return Token(TokenType.LT, line, rel)
         if self.ch == "|":
             self._next()
             if self.ch == "|":
                 self._next()
-                return Token(TokenType.LOGIC_OR, self.line, self.rel-2)
+                return Token(TokenType.LOGIC_OR, line, rel)
             elif self.ch == ">":
                 self._next()
                 if self.ch == ">":
                     self._next()
-                    return Token(TokenType.PIPE_LAST, self.line, self.rel-3)
-                return Token(TokenType.PIPE_FIRST, self.line, self.rel-2)
-            return Token(TokenType.BIN_OR, self.line, self.rel-1)
-        raise SyntaxError(f"Invalid character '{self.ch}'")
+                    return Token(TokenType.PIPE_LAST, line, rel)
+                return Token(TokenType.PIPE_FIRST, line, rel)
+            return Token(TokenType.BIN_OR, line, rel)
+        if self.ch == "&":
+            self._next()
+            if self.ch == "&":
+                self._next()
+                return Token(TokenType.LOGIC_AND, line, rel)
+            return Token(TokenType.BIN_AND, line, rel)
+        if self.ch == "^":
+            self._next()
+            return Token(TokenType.BIN_XOR, line, rel)
+        ch = self.ch
+        self._next()
+        raise RadonSyntaxError(f"Invalid character '{ch}'", line, rel)
+
+BLOCK_KEYWORDS = (Keyword.IF, Keyword.FN, Keyword.LAMBDA, Keyword.CLASS)
 
 class Parser:
     def __init__(self, src):
+        self.errors: list[RadonSyntaxError] = []
+        self.depth = 0 # number of currently open `... end` blocks
         self.lexer = Lexer(src)
         self.tok: Token = None
-        self.next_tok()
+        self.skip_tok()
     def next_tok(self):
-        self.tok = self.lexer.get_next()
+        try:
+            self.tok = self.lexer.get_next()
+        except RadonSyntaxError:
+            # the lexer has already skipped the bad input, so just stand on something harmless
+            self.tok = Token(TokenType.SEMICOLON, self.lexer.line, self.lexer.rel)
+            raise
     def next_ch(self):
         return self.lexer._next()
+    def error(self, msg: str):
+        if self.tok.type == TokenType.EOF:
+            return RadonSyntaxError(msg, self.lexer.line, self.lexer.rel)
+        return RadonSyntaxError(msg, self.tok.line, self.tok.offset)
     def run(self):
         body = []
         while self.tok.type != TokenType.EOF:
             body.append(self.statement())
+        if self.errors:
+            e = self.errors[0]
+            e.errors = self.errors
+            raise e
         return body
     def statement(self):
+        "Parses a statement; on a syntax error, records it and skips to the next statement boundary"
+        start_tok, start_depth = self.tok, self.depth
+        try:
+            return self.parse_statement()
+        except RadonSyntaxError as e:
+            self.errors.append(e)
+            self.synchronize(self.depth - start_depth)
+            self.depth = start_depth
+            if self.tok is start_tok:
+                self.next_tok()
+            return NodeExpr(NodeConst(None, lineno=e.lineno, col_offset=e.offset), lineno=e.lineno, col_offset=e.offset)
+    def synchronize(self, unclosed: int):
+        # skips until the ';' ending the broken statement, or past the 'end' closing
+        # every block it opened; an 'end' belonging to an enclosing block is left alone
+        prev = None
+        while self.tok.type != TokenType.EOF:
+            tok = self.tok
+            if tok.type == TokenType.KEYWORD and tok.value == Keyword.END:
+                if unclosed == 0:
+                    return
+                unclosed -= 1
+                self.skip_tok()
+                if unclosed == 0:
+                    return
+                continue
+            if tok.type == TokenType.SEMICOLON and unclosed == 0:
+                while self.tok.type == TokenType.SEMICOLON:
+                    self.skip_tok()
+                return
+            if tok.type == TokenType.KEYWORD and tok.value in BLOCK_KEYWORDS:
+                if not (tok.value == Keyword.IF and prev is not None and prev.type == TokenType.KEYWORD and prev.value == Keyword.ELSE):
+                    unclosed += 1
+            prev = tok
+            self.skip_tok()
+    def skip_tok(self):
+        try:
+            self.next_tok()
+        except RadonSyntaxError as e:
+            self.errors.append(e)
+    def parse_statement(self):
         while self.tok.type == TokenType.SEMICOLON:
             self.next_tok()
         if self.tok.type == TokenType.KEYWORD:
@@ -207,27 +378,50 @@ class Parser:
                 pass
             elif self.tok.value == Keyword.CLASS:
                 return self.kw_class()
+            elif self.tok.value == Keyword.CONST:
+                return self.kw_const()
             else:
-                assert False, f"keyword {self.tok} cannot be used here"
+                raise self.error(f"keyword {self.tok} cannot be used here")
         v = self.expr()
         if self.tok.type == TokenType.ASSIGN:
             if isinstance(v, (NodeIden, NodeAttr, NodeIndex)):
                 v.context = "store"
             else:
-                assert False, "assignment to this expression is not supported"
+                raise self.error("assignment to this expression is not supported")
             self.next_tok()
             v = NodeAssign([v], self.expr(), lineno=v.lineno, col_offset=v.col_offset)
 
-            assert self.tok.type == TokenType.SEMICOLON, f"';' expected, got {self.tok}"
+            if self.tok.type != TokenType.SEMICOLON:
+                raise self.error(f"';' expected, got {self.tok}")
             self.next_tok()
             return v
             
-        assert self.tok.type == TokenType.SEMICOLON, f"';' expected, got {self.tok}"
+        if self.tok.type != TokenType.SEMICOLON:
+            raise self.error(f"';' expected, got {self.tok}")
         self.next_tok()
         return NodeExpr(v, lineno=v.lineno, col_offset=v.col_offset)
     
+    def kw_const(self):
+        ln, co = self.tok.line, self.tok.offset
+        if self.depth != 0:
+            raise self.error("const can only be declared at the top level of a module")
+        self.next_tok()
+        if self.tok.type != TokenType.IDEN:
+            raise self.error(f"identifier expected")
+        name = self.tok.value
+        self.next_tok()
+        if self.tok.type != TokenType.ASSIGN:
+            raise self.error(f"'=' expected, got {self.tok}")
+        self.next_tok()
+        value = self.expr()
+        if self.tok.type != TokenType.SEMICOLON:
+            raise self.error(f"';' expected, got {self.tok}")
+        self.next_tok()
+        return NodeConstDef(name, value, lineno=ln, col_offset=co)
+
     def kw_class(self):
         ln, co = self.tok.line, self.tok.offset
+        self.depth += 1
         self.next_tok()
 
         name = self.get_iden()
@@ -242,56 +436,80 @@ class Parser:
                     break
                 bases.append(self.expr())
                 if self.tok.type != TokenType.RPAR:
-                    assert self.tok.type == TokenType.COMMA, "',' or ')' expected"
+                    if self.tok.type != TokenType.COMMA:
+                        raise self.error("',' or ')' expected")
                     self.next_tok()
         
+        attrs = []
+        while self.tok.type == TokenType.AT:
+            self.next_tok()
+            attrs.append(self.expr())
+
         while self.tok.value != Keyword.END:
+            if self.tok.type == TokenType.EOF:
+                raise self.error(f"'end' expected for a class-statement")
             body.append(self.statement())
         self.next_tok()
 
-        return NodeClassDef(name, body, bases, [], lineno=ln, col_offset=co)
+        self.depth -= 1
+        return NodeClassDef(name, body, bases, attrs, [], lineno=ln, col_offset=co)
 
     def kw_import(self):
-        assert self.tok.value == Keyword.IMPORT, f"'import' expected, got {self.tok}"
+        if self.tok.value != Keyword.IMPORT:
+            raise self.error(f"'import' expected, got {self.tok}")
         ln, co = self.tok.line, self.tok.offset
         self.next_tok()
 
         iden = []
-        assert self.tok.type == TokenType.IDEN, f"identifier expected"
+        if self.tok.type != TokenType.IDEN:
+            raise self.error(f"identifier expected")
         iden.append(self.tok.value)
         self.next_tok()
 
         while self.tok.type == TokenType.DOT:
             self.next_tok()
-            assert self.tok.type == TokenType.IDEN, f"identifier expected"
+            if self.tok.type != TokenType.IDEN:
+                raise self.error(f"identifier expected")
             iden.append(self.tok.value)
             self.next_tok()
         
         as_name = None
         if self.tok.type == TokenType.KEYWORD and self.tok.value == Keyword.AS:
             self.next_tok()
-            assert self.tok.type == TokenType.IDEN, f"identifier expected"
+            if self.tok.type != TokenType.IDEN:
+                raise self.error(f"identifier expected")
             as_name = self.tok.value
             self.next_tok()
         
-        assert self.tok.type == TokenType.SEMICOLON, f"';' expected, got {self.tok}"
+        attrs = []
+        while self.tok.type == TokenType.AT:
+            self.next_tok()
+            attrs.append(self.expr())
+
+        if self.tok.type != TokenType.SEMICOLON:
+            raise self.error(f"';' expected, got {self.tok}")
         self.next_tok()
 
-        return NodeExpr(NodeImportRadon(iden, as_name, lineno=ln, col_offset=co), lineno=ln, col_offset=co)
+        return NodeExpr(NodeImportRadon(iden, as_name, attrs, lineno=ln, col_offset=co), lineno=ln, col_offset=co)
         
-    def kw_if(self):
-        assert self.tok.value == Keyword.IF, f"'if' expected, got {self.tok}"
+    def kw_if(self, chained=False):
+        if self.tok.value != Keyword.IF:
+            raise self.error(f"'if' expected, got {self.tok}")
         ln, co = self.tok.line, self.tok.offset
+        if not chained:
+            self.depth += 1
         self.next_tok()
         expr = self.expr()
 
-        assert self.tok.type == TokenType.KEYWORD and self.tok.value == Keyword.THEN, f"'then' expected, got {self.tok}"
+        if self.tok.type != TokenType.KEYWORD or self.tok.value != Keyword.THEN:
+            raise self.error(f"'then' expected, got {self.tok}")
         self.next_tok()
 
         body = []
         orelse = []
         while True:
-            assert self.tok.type != TokenType.EOF, f"'end' expected for an if-statement"
+            if self.tok.type == TokenType.EOF:
+                raise self.error(f"'end' expected for an if-statement")
             if self.tok.type == TokenType.KEYWORD:
                 if self.tok.value == Keyword.END:
                     self.next_tok()
@@ -299,11 +517,12 @@ class Parser:
                 elif self.tok.value == Keyword.ELSE:
                     self.next_tok()
                     if self.tok.value == Keyword.IF:
-                        orelse = [self.kw_if()]
+                        orelse = [self.kw_if(chained=True)]
                         break
                     else:
                         while True:
-                            assert self.tok.type != TokenType.EOF, f"'end' expected for an if-statement"
+                            if self.tok.type == TokenType.EOF:
+                                raise self.error(f"'end' expected for an if-statement")
                             if self.tok.type == TokenType.KEYWORD:
                                 if self.tok.value == Keyword.END:
                                     self.next_tok()
@@ -311,17 +530,55 @@ class Parser:
                             orelse.append(self.statement())
                         break
             body.append(self.statement())
+        if not chained:
+            self.depth -= 1
         return NodeIf(expr, body, orelse, lineno=ln, col_offset=co)
 
     def expr(self):
-        return self.expr_compare()
+        return self.expr_logic_or()
+    def expr_logic_or(self):
+        left = self.expr_logic_and()
+        if self.tok.type != TokenType.LOGIC_OR:
+            return left
+        values = [left]
+        while self.tok.type == TokenType.LOGIC_OR:
+            self.next_tok()
+            values.append(self.expr_logic_and())
+        return NodeBoolOp(BoolOp.OR, values, lineno=left.lineno, col_offset=left.col_offset)
+    def expr_logic_and(self):
+        left = self.expr_compare()
+        if self.tok.type != TokenType.LOGIC_AND:
+            return left
+        values = [left]
+        while self.tok.type == TokenType.LOGIC_AND:
+            self.next_tok()
+            values.append(self.expr_compare())
+        return NodeBoolOp(BoolOp.AND, values, lineno=left.lineno, col_offset=left.col_offset)
     def expr_compare(self):
-        left = self.expr_pipe()
+        left = self.expr_bin_or()
         while self.tok.type in (TokenType.EQ, TokenType.NEQ, TokenType.GT, TokenType.LT, TokenType.GTE, TokenType.LTE):
             op = getattr(Comparator, self.tok.type.name)
             self.next_tok()
             left = NodeCompare(left, op, self.expr_compare(), lineno=left.lineno, col_offset=left.col_offset)
         return left
+    def expr_bin_or(self):
+        left = self.expr_bin_xor()
+        while self.tok.type == TokenType.BIN_OR:
+            self.next_tok()
+            left = NodeBinOp(left, BinOp.BIN_OR, self.expr_bin_xor(), lineno=left.lineno, col_offset=left.col_offset)
+        return left
+    def expr_bin_xor(self):
+        left = self.expr_bin_and()
+        while self.tok.type == TokenType.BIN_XOR:
+            self.next_tok()
+            left = NodeBinOp(left, BinOp.BIN_XOR, self.expr_bin_and(), lineno=left.lineno, col_offset=left.col_offset)
+        return left
+    def expr_bin_and(self):
+        left = self.expr_pipe()
+        while self.tok.type == TokenType.BIN_AND:
+            self.next_tok()
+            left = NodeBinOp(left, BinOp.BIN_AND, self.expr_pipe(), lineno=left.lineno, col_offset=left.col_offset)
+        return left
     def expr_pipe(self):
         left = self.expr_add_sub()
         while self.tok.type in (TokenType.PIPE_FIRST, TokenType.PIPE_LAST):
@@ -337,15 +594,23 @@ class Parser:
         while self.tok.type in (TokenType.PLUS, TokenType.MINUS):
             op = {TokenType.PLUS: BinOp.ADD, TokenType.MINUS: BinOp.SUB}[self.tok.type]
             self.next_tok()
-            left = NodeBinOp(left, op, self.expr_add_sub(), lineno=left.lineno, col_offset=left.col_offset)
+            left = NodeBinOp(left, op, self.expr_mul_div(), lineno=left.lineno, col_offset=left.col_offset)
         return left
     def expr_mul_div(self):
-        left = self.expr_idx_attr_call()
-        while self.tok.type in (TokenType.MULTIPLY, TokenType.DIVIDE):
-            op = {TokenType.MULTIPLY: BinOp.MUL, TokenType.DIVIDE: BinOp.DIV}[self.tok.type]
+        left = self.expr_unary()
+        while self.tok.type in (TokenType.MULTIPLY, TokenType.DIVIDE, TokenType.MOD):
+            op = {TokenType.MULTIPLY: BinOp.MUL, TokenType.DIVIDE: BinOp.DIV, TokenType.MOD: BinOp.MOD}[self.tok.type]
             self.next_tok()
-            left = NodeBinOp(left, op, self.expr_mul_div(), lineno=left.lineno, col_offset=left.col_offset)
+            left = NodeBinOp(left, op, self.expr_unary(), lineno=left.lineno, col_offset=left.col_offset)
         return left
+    def expr_unary(self):
+        # like in C, `!` binds tighter than every binary operator: `!a == b` is `(!a) == b`
+        if self.tok.type in (TokenType.NOT, TokenType.MINUS, TokenType.PLUS):
+            op = {TokenType.NOT: UnaryOp.NOT, TokenType.MINUS: UnaryOp.NEG, TokenType.PLUS: UnaryOp.POS}[self.tok.type]
+            ln, co = self.tok.line, self.tok.offset
+            self.next_tok()
+            return NodeUnaryOp(op, self.expr_unary(), lineno=ln, col_offset=co)
+        return self.expr_idx_attr_call()
     def eslice(self, lower):
         self.next_tok()
         upper = None
@@ -361,7 +626,8 @@ class Parser:
         while self.tok.type in (TokenType.DOT, TokenType.LPAR, TokenType.LBRK):
             if self.tok.type == TokenType.DOT:
                 self.next_tok()
-                assert self.tok.type == TokenType.IDEN, f"identifier expected, got {self.tok}"
+                if self.tok.type != TokenType.IDEN:
+                    raise self.error(f"identifier expected, got {self.tok}")
                 left = NodeAttr(left, self.tok.value, "load", lineno=self.tok.line, col_offset=self.tok.offset)
                 self.next_tok()
             elif self.tok.type == TokenType.LBRK:
@@ -372,7 +638,8 @@ class Parser:
                     index = self.expr()
                     if self.tok.type == TokenType.COLON:
                         index = self.eslice(index)
-                assert self.tok.type == TokenType.RBRK, f"']' expected, got {self.tok}"
+                if self.tok.type != TokenType.RBRK:
+                    raise self.error(f"']' expected, got {self.tok}")
                 self.next_tok()
                 left = NodeIndex(left, index, "load", lineno=self.tok.line, col_offset=self.tok.offset)
             elif self.tok.type == TokenType.LPAR:
@@ -384,13 +651,20 @@ class Parser:
                         self.next_tok()
                         break
                     expr = self.expr()
+                    if self.is_kw(Keyword.FOR) and len(args) == 0 and len(kwargs) == 0:
+                        # f(x for x in xs)
+                        expr = NodeGeneratorExp(expr, self.comprehension_clauses(), lineno=expr.lineno, col_offset=expr.col_offset)
+                        if self.tok.type != TokenType.RPAR:
+                            raise self.error(f"')' expected after a generator argument, got {self.tok}")
                     if self.tok.type == TokenType.ASSIGN:
-                        assert isinstance(expr, NodeIden), "identifier expected as a keyword argument"
+                        if not isinstance(expr, NodeIden):
+                            raise self.error("identifier expected as a keyword argument")
                         self.next_tok()
                         kwargs[expr.iden] = self.expr()
                     else:
                         args.append(expr)
-                    assert self.tok.type in (TokenType.RPAR, TokenType.COMMA), f"',' or ')' expected, got {self.tok}"
+                    if self.tok.type not in (TokenType.RPAR, TokenType.COMMA):
+                        raise self.error(f"',' or ')' expected, got {self.tok}")
                     if self.tok.type == TokenType.RPAR:
                         self.next_tok()
                         break
@@ -406,25 +680,37 @@ class Parser:
             v = NodeConst(self.tok.value, lineno=self.tok.line, col_offset=self.tok.offset)
             self.next_tok()
             return v
+        elif self.tok.type == TokenType.FSTR:
+            v = NodeFormatStr(self.fstring_parts(self.tok.value), lineno=self.tok.line, col_offset=self.tok.offset)
+            self.next_tok()
+            return v
+        elif self.tok.type == TokenType.REGEX:
+            v = NodeRegex(*self.tok.value, lineno=self.tok.line, col_offset=self.tok.offset)
+            self.next_tok()
+            return v
         elif self.tok.type == TokenType.IDEN:
             v = NodeIden(self.tok.value, "load", lineno=self.tok.line, col_offset=self.tok.offset)
             self.next_tok()
             return v
         elif self.tok.type == TokenType.LPAR:
+            ln, co = self.tok.line, self.tok.offset
             self.next_tok()
             data = []
             data.append(self.expr())
+            if self.is_kw(Keyword.FOR):
+                data = [NodeGeneratorExp(data[0], self.comprehension_clauses(), lineno=ln, col_offset=co)]
             while self.tok.type == TokenType.COMMA:
                 self.next_tok()
                 if self.tok.type == TokenType.RPAR:
                     self.next_tok()
-                    return NodeTuple(data)
+                    return NodeTuple(data, "load", lineno=ln, col_offset=co)
                 data.append(self.expr())
-            assert self.tok.type == TokenType.RPAR, "')' expected"
+            if self.tok.type != TokenType.RPAR:
+                raise self.error("')' expected")
             self.next_tok()
             if len(data) == 1:
                 return data[0]
-            return NodeTuple(data)
+            return NodeTuple(data, "load", lineno=ln, col_offset=co)
         elif self.tok.type == TokenType.LBRK:
             ln, co = self.tok.line, self.tok.offset
             self.next_tok()
@@ -434,13 +720,27 @@ class Parser:
                     self.next_tok()
                     break
                 args.append(self.expr())
-                assert self.tok.type in (TokenType.RBRK, TokenType.COMMA), "',' or ']' expected"
+                if self.is_kw(Keyword.FOR) and len(args) == 1:
+                    generators = self.comprehension_clauses()
+                    if self.tok.type != TokenType.RBRK:
+                        raise self.error(f"']' expected, got {self.tok}")
+                    self.next_tok()
+                    return NodeListComp(args[0], generators, lineno=ln, col_offset=co)
+                if self.tok.type not in (TokenType.RBRK, TokenType.COMMA):
+                    raise self.error("',' or ']' expected")
                 if self.tok.type == TokenType.RBRK:
                     self.next_tok()
                     break
                 else:
                     self.next_tok()
             return NodeList(args, "load", lineno=ln, col_offset=co)
+        elif self.tok.type == TokenType.HASH:
+            # #[1, 2, 3] is an array literal (numpy.ndarray when NumPy is available)
+            ln, co = self.tok.line, self.tok.offset
+            self.next_tok()
+            if self.tok.type != TokenType.LBRK:
+                raise self.error(f"'[' expected after '#', got {self.tok}")
+            return NodeArray(self.expr_final(), lineno=ln, col_offset=co)
         elif self.tok.type == TokenType.LCUR:
             ln, co = self.tok.line, self.tok.offset
             self.next_tok()
@@ -451,10 +751,24 @@ class Parser:
                     self.next_tok()
                     break
                 keys.append(self.expr())
-                assert self.tok.type == TokenType.COLON, "':' expected"
+                if self.is_kw(Keyword.FOR) and len(keys) == 1:
+                    generators = self.comprehension_clauses()
+                    if self.tok.type != TokenType.RCUR:
+                        raise self.error(f"'}}' expected, got {self.tok}")
+                    self.next_tok()
+                    return NodeSetComp(keys[0], generators, lineno=ln, col_offset=co)
+                if self.tok.type != TokenType.COLON:
+                    raise self.error("':' expected")
                 self.next_tok()
                 values.append(self.expr())
-                assert self.tok.type in (TokenType.RCUR, TokenType.COMMA), "',' or '}' expected"
+                if self.is_kw(Keyword.FOR) and len(keys) == 1:
+                    generators = self.comprehension_clauses()
+                    if self.tok.type != TokenType.RCUR:
+                        raise self.error(f"'}}' expected, got {self.tok}")
+                    self.next_tok()
+                    return NodeDictComp(keys[0], values[0], generators, lineno=ln, col_offset=co)
+                if self.tok.type not in (TokenType.RCUR, TokenType.COMMA):
+                    raise self.error("',' or '}' expected")
                 if self.tok.type == TokenType.RCUR:
                     self.next_tok()
                     break
@@ -469,10 +783,7 @@ class Parser:
                 self.next_tok()
                 return NodeAwait(self.expr(), lineno=ln, col_offset=co)
             else:
-                assert False, f"Keyword {self.tok.value} cannot be used in expression"
-        elif self.tok.type == TokenType.NOT:
-            self.next_tok()
-            return NodeUnaryOp(UnaryOp.NOT, self.expr())
+                raise self.error(f"Keyword {self.tok.value} cannot be used in expression")
         elif self.tok.type == TokenType.LT:
             # ex parsing mode
             self.textmode_enter()
@@ -480,9 +791,56 @@ class Parser:
             tag = self.textmode_parse_xml_tag()
             self.lexer.idx -= 1 # fix offset
             self.textmode_exit()
-            return NodeList(tag, "load", lineno=self.tok.line, col_offset=self.tok.offset)
-        assert False, (f"Expected atom, got {self.tok}")
+            return tag
+        raise self.error(f"Expected atom, got {self.tok}")
     
+    def fstring_parts(self, parts):
+        nodes = []
+        for part in parts:
+            if isinstance(part, str):
+                nodes.append(NodeConst(part, lineno=self.tok.line, col_offset=self.tok.offset))
+                continue
+            source, conversion, spec = part
+            sub = Parser(source)
+            try:
+                if sub.errors:
+                    raise sub.errors[0]
+                value = sub.expr()
+                if sub.tok.type != TokenType.EOF:
+                    raise sub.error(f"unexpected {sub.tok}")
+            except RadonSyntaxError as e:
+                raise self.error(f"in f-string expression {source.strip()!r}: {e.msg}") from None
+            # the expression's positions are relative to the string, so point them all at the literal
+            for n in walk(value):
+                n.lineno, n.col_offset = self.tok.line, self.tok.offset
+            nodes.append(NodeFormatValue(value, conversion, self.fstring_parts(spec) if spec is not None else None, lineno=self.tok.line, col_offset=self.tok.offset))
+        return nodes
+
+    def is_kw(self, keyword: Keyword):
+        return self.tok.type == TokenType.KEYWORD and self.tok.value == keyword
+
+    def comprehension_clauses(self):
+        "Parses the `for target in iter if cond ...` clauses following a comprehension's element"
+        generators = []
+        while self.is_kw(Keyword.FOR):
+            ln, co = self.tok.line, self.tok.offset
+            self.next_tok()
+            targets = [NodeIden(self.get_iden(), "store", lineno=ln, col_offset=co)]
+            while self.tok.type == TokenType.COMMA:
+                self.next_tok()
+                targets.append(NodeIden(self.get_iden(), "store", lineno=ln, col_offset=co))
+            target = targets[0] if len(targets) == 1 else NodeTuple(targets, "store", lineno=ln, col_offset=co)
+            if not self.is_kw(Keyword.IN):
+                raise self.error(f"'in' expected, got {self.tok}")
+            self.next_tok()
+            iterable = self.expr()
+            ifs = []
+            while self.is_kw(Keyword.IF):
+                self.next_tok()
+                ifs.append(self.expr())
+            generators.append(NodeComprehension(target, iterable, ifs, lineno=ln, col_offset=co))
+        return generators
+
     def textmode_parse_xml_tag(self):
         contents = [""]
         attrkeys, attrvalues = [], []
@@ -494,14 +852,16 @@ class Parser:
         while self.textmode_ch in string.ascii_letters + "0123456789-_":
             attrkeys.append(NodeConst(self.textmode_iden(), lineno=self.tok.line, col_offset=self.tok.offset))
             self.textmode_skipspace()
-            assert (x := self.textmode_ch) == "=", f"'=' expected got {x}"
+            if (x := self.textmode_ch) != "=":
+                raise self.error(f"'=' expected got {x}")
             self.textmode_exit()
             attrvalues.append(self.expr_final())
             self.textmode_enter()
             self.lexer.idx -= 1
             self.textmode_ch = self.next_ch()
             self.textmode_skipspace()
-        assert (x := self.textmode_ch) == ">", f"tag closing expected got {x}"
+        if (x := self.textmode_ch) != ">":
+            raise self.error(f"tag closing expected got {x}")
         self.textmode_ch = self.next_ch()
         while True:
             if self.textmode_ch == "<":
@@ -512,26 +872,30 @@ class Parser:
                     self.textmode_skipspace()
                     tag2 = self.textmode_iden()
                     self.textmode_skipspace()
-                    assert tag2 == tag, f"ending tag was expected to be {tag}, got {tag2}"
-                    assert (x := self.textmode_ch) == ">", f"tag closing expected got {x}"
+                    if tag2 != tag:
+                        raise self.error(f"ending tag was expected to be {tag}, got {tag2}")
+                    if (x := self.textmode_ch) != ">":
+                        raise self.error(f"tag closing expected got {x}")
                     self.textmode_ch = self.next_ch()
                     break
                 else:
                     self.lexer.idx -= 3
                     self.textmode_ch = self.next_ch()
-                    contents.append(NodeList(self.textmode_parse_xml_tag(), "load", lineno=self.tok.line, col_offset=self.tok.offset))
+                    contents.append(self.textmode_parse_xml_tag())
                     contents.append("")
             else:
                 contents[-1] += self.textmode_ch
                 self.textmode_ch = self.next_ch()
-        return [NodeConst(tag, lineno=self.tok.line, col_offset=self.tok.offset), NodeDict(attrkeys, attrvalues, lineno=self.tok.line, col_offset=self.tok.offset), *[(i if not isinstance(i, str) else NodeConst(i, lineno=self.tok.line, col_offset=self.tok.offset)) for i in contents if (i.strip() != "" if isinstance(i, str) else True)]]
+        children = [(i if not isinstance(i, str) else NodeConst(i, lineno=self.tok.line, col_offset=self.tok.offset)) for i in contents if (i.strip() != "" if isinstance(i, str) else True)]
+        return NodeXml(tag, attrkeys, attrvalues, children, lineno=self.tok.line, col_offset=self.tok.offset)
     
     def textmode_skipspace(self):
         while self.textmode_ch in " \n\t\r\v":
             self.textmode_ch = self.next_ch()
 
     def textmode_iden(self):
-        assert self.textmode_ch in string.ascii_letters + "0123456789-_", f"identifier expected got {self.textmode_ch}"
+        if self.textmode_ch not in string.ascii_letters + "0123456789-_":
+            raise self.error(f"identifier expected got {self.textmode_ch}")
         b = ""
         while self.textmode_ch in string.ascii_letters + "0123456789-_":
             b += self.textmode_ch
@@ -539,7 +903,8 @@ class Parser:
         return b
 
     def parse_func_args(self):
-        assert self.tok.type == TokenType.LPAR, f"'(' expected"
+        if self.tok.type != TokenType.LPAR:
+            raise self.error(f"'(' expected")
         self.next_tok()
 
         args = []
@@ -564,8 +929,9 @@ class Parser:
                     i = self.get_iden()
                     args.append(PosVarArg(i))
             else:
-                assert False, f"invalid fn/lambda argument"
-            assert self.tok.type in (TokenType.RPAR, TokenType.COMMA), "',' or ')' expected"
+                raise self.error(f"invalid fn/lambda argument")
+            if self.tok.type not in (TokenType.RPAR, TokenType.COMMA):
+                raise self.error("',' or ')' expected")
             if self.tok.type == TokenType.RPAR:
                 self.next_tok()
                 break
@@ -578,8 +944,10 @@ class Parser:
         return args, attrs
 
     def func(self):
-        assert self.tok.type == TokenType.KEYWORD and self.tok.value == Keyword.FN, f"'fn' expected"
+        if self.tok.type != TokenType.KEYWORD or self.tok.value != Keyword.FN:
+            raise self.error(f"'fn' expected")
         ln, co = self.tok.line, self.tok.offset
+        self.depth += 1
         self.next_tok()
 
         name = self.get_iden()
@@ -587,32 +955,39 @@ class Parser:
         
         body = []
         while True:
-            assert self.tok.type != TokenType.EOF, f"'end' expected for an fn-statement"
+            if self.tok.type == TokenType.EOF:
+                raise self.error(f"'end' expected for an fn-statement")
             if self.tok.type == TokenType.KEYWORD and self.tok.value == Keyword.END:
                 self.next_tok()
                 break
             body.append(self.statement())
         
+        self.depth -= 1
         return NodeFunc(name, args, attrs, body, [], lineno=ln, col_offset=co)
     
     def kw_lambda(self):
-        assert self.tok.type == TokenType.KEYWORD and self.tok.value == Keyword.LAMBDA, f"'lambda' expected"
+        if self.tok.type != TokenType.KEYWORD or self.tok.value != Keyword.LAMBDA:
+            raise self.error(f"'lambda' expected")
         ln, co = self.tok.line, self.tok.offset
+        self.depth += 1
         self.next_tok()
 
         args, attrs = self.parse_func_args()
         
         body = []
         while True:
-            assert self.tok.type != TokenType.EOF, f"'end' expected for a lambda-statement"
+            if self.tok.type == TokenType.EOF:
+                raise self.error(f"'end' expected for a lambda-statement")
             if self.tok.type == TokenType.KEYWORD and self.tok.value == Keyword.END:
                 self.next_tok()
                 break
             body.append(self.statement())
+        self.depth -= 1
         return NodeLambda(args, attrs, body, lineno=ln, col_offset=co)
     
     def get_iden(self):
-        assert self.tok.type == TokenType.IDEN, f"identifier expected"
+        if self.tok.type != TokenType.IDEN:
+            raise self.error(f"identifier expected")
         v = self.tok.value
         self.next_tok()
         return v
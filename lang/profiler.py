@@ -0,0 +1,87 @@
+# Low-overhead sampling profiler for Radon scripts. A background thread
+# periodically grabs the stack of the profiled thread, keeps only frames that
+# come from .rad files and attributes the sample to the innermost one.
+import os
+import re
+import sys
+import threading
+from collections import Counter
+
+LAMBDA_NAME = re.compile(r"_radon_[0-9a-f]+_local_\d+")
+
+def is_radon_code(code):
+    return code.co_filename.endswith(".rad")
+
+def code_label(code):
+    filename = os.path.basename(code.co_filename)
+    if LAMBDA_NAME.fullmatch(code.co_name):
+        return f"{filename}:{code.co_firstlineno} lambda"
+    if code.co_name == "<module>":
+        return f"{filename} <module>"
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+class Sampler:
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.samples = 0
+        self.lines = Counter()
+        self.functions_self = Counter()
+        self.functions_total = Counter()
+        self.stacks = Counter()
+        self.thread_id = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, thread_id: int | None = None):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="radon-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.sample(frame)
+
+    def sample(self, frame):
+        stack = []
+        while frame is not None:
+            if is_radon_code(frame.f_code):
+                stack.append(frame)
+            frame = frame.f_back
+        if not stack:
+            return
+        self.samples += 1
+        leaf = stack[0]
+        self.lines[(os.path.basename(leaf.f_code.co_filename), leaf.f_lineno)] += 1
+        labels = [code_label(f.f_code) for f in reversed(stack)]
+        self.functions_self[labels[-1]] += 1
+        for label in set(labels):
+            self.functions_total[label] += 1
+        self.stacks[";".join(labels)] += 1
+
+    def report(self, out, limit: int = 20):
+        if self.samples == 0:
+            out.write("radon profiler: no samples collected\n")
+            return
+        out.write(f"radon profiler: {self.samples} samples, {self.interval * 1000:g}ms interval\n\n")
+        out.write(f"{'self':>7} {'total':>7}  function\n")
+        labels = sorted(self.functions_total, key=lambda x: (self.functions_self[x], self.functions_total[x]), reverse=True)
+        for label in labels[:limit]:
+            out.write(f"{self.functions_self[label] / self.samples:7.1%} {self.functions_total[label] / self.samples:7.1%}  {label}\n")
+        out.write(f"\n{'self':>7}  line\n")
+        for (filename, line), count in self.lines.most_common(limit):
+            out.write(f"{count / self.samples:7.1%}  {filename}:{line}\n")
+        out.flush()
+
+    def write_collapsed(self, out):
+        "Writes stacks in the collapsed format understood by flamegraph.pl / speedscope"
+        for stack, count in self.stacks.items():
+            out.write(f"{stack} {count}\n")
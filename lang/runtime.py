@@ -1,50 +1,69 @@
 from lang.parser import Parser
 from lang.translator import Translator
+from lang.errors import RadonSyntaxError
 import importlib
 import importlib.util
+import functools
+import os
 import sys
+import threading
+from lang.bootstrap import init, LazyModule, COMPILE_FLAGS, run_code, import_async
 
-def init():
-    try:
-        import fishhook
-        def foreach(self, func):
-            for i in self:
-                func(i)
-        def foreach_dict(self, func):
-            for pair in self.items():
-                func(*pair)
-        
-        fishhook.hook(list)(foreach)
-        fishhook.hook(tuple)(foreach)
-        fishhook.hook(set)(foreach)
-        fishhook.hook(dict, name="foreach")(foreach_dict)
-    except ImportError as e:
-        if e.name != "fishhook":
-            raise e from None
-        import warnings
-        warnings.warn(RuntimeWarning("Could not import fishhook. Some standard features will not be available."))
+# one lock per module name, held across the sys.modules lookup, the import and the registration,
+# so threads importing the same module at once run its body only once
+_import_locks: dict[str, threading.RLock] = {}
+_import_locks_lock = threading.Lock()
+
+def import_lock(name: str):
+    with _import_locks_lock:
+        lock = _import_locks.get(name)
+        if lock is None:
+            lock = _import_locks[name] = threading.RLock()
+    return lock
 
 def import_module_from_radon_string(name: str, source: str, filename: str):
+    "Runs Radon source as a new module registered in sys.modules as `name`, replacing any module already there"
     try:
         parser = Parser(source)
         ast = parser.run()
-    except AssertionError as e:
-        raise SyntaxError(*e.args) from None
+        pyast = Translator().run(ast)
+    except RadonSyntaxError as e:
+        raise e.set_filename(filename) from None
 
-    pyast = Translator().run(ast)
     spec = importlib.util.spec_from_loader(name, loader=None)
     module = importlib.util.module_from_spec(spec)
-    exec(compile(pyast, filename, "exec"), module.__dict__)
-    sys.modules[name] = module
-    globals()[name] = module
-
+    module.__file__ = filename
+    install(module.__dict__)
+    with import_lock(name):
+        # registered before the body runs, so that like in Python an import cycle gets the partly run module
+        sys.modules[name] = module
+        try:
+            run_code(compile(pyast, filename, "exec", flags=COMPILE_FLAGS), module.__dict__)
+        except BaseException:
+            sys.modules.pop(name, None)
+            raise
     return module
 
+def loaded_module(name: str, filename: str):
+    module = sys.modules.get(name)
+    if module is not None and getattr(module, "__file__", None) == filename:
+        return module
+    return None
+
 def import_module_from_radon_file(names: list[str], as_name: str):
+    "Imports a .rad module, or returns it if it's already been imported under that name"
     if as_name is None:
         as_name = ".".join(names)
-    filename = "/".join(names) + ".rad"
-    return import_module_from_radon_string(as_name, open(filename).read(), filename)
+    filename = os.path.abspath("/".join(names) + ".rad")
+    module = loaded_module(as_name, filename)
+    if module is not None:
+        return module
+    with import_lock(as_name):
+        # another thread may have imported it while this one waited for the lock
+        module = loaded_module(as_name, filename)
+        if module is not None:
+            return module
+        return import_module_from_radon_string(as_name, open(filename).read(), filename)
 
 def import_module_generic(names: list[str], as_name: str):
     if as_name is None:
@@ -53,4 +72,12 @@ def import_module_generic(names: list[str], as_name: str):
         return import_module_from_radon_file(names, as_name)
     except FileNotFoundError:
         return importlib.import_module(".".join(names), package=None)
-    
\ No newline at end of file
+    
+def import_module_lazy(names: list[str], as_name: str):
+    return LazyModule(import_module_generic, names, as_name)
+
+def install(namespace: dict):
+    "Makes Radon imports work in code executed with `namespace` as its globals"
+    namespace["_global_radon_se_import"] = import_module_generic
+    namespace["_global_radon_se_import_lazy"] = import_module_lazy
+    namespace["_global_radon_se_import_async"] = functools.partial(import_async, import_module_generic)
@@ -0,0 +1,147 @@
+# Scope analysis over the Radon AST. Radon has no `global` / `nonlocal`, so
+# like in Python any name assigned inside a fn or lambda is local to it; every
+# other name is either captured from an enclosing fn, a module global or a builtin.
+import builtins
+from .nodes import *
+
+LOCAL = "local"
+CLOSURE = "closure"
+GLOBAL = "global"
+BUILTIN = "builtin"
+
+class Scope:
+    def __init__(self, node: Node | None, parent: "Scope | None", kind: str):
+        self.node = node
+        self.parent = parent
+        self.kind = kind # "module", "function" or "class"
+        self.locals: set[str] = set()
+        self.loads: set[str] = set()
+        self.children: list[Scope] = []
+        # module scope only: names bound exactly once by an unconditional top-level statement, with that line
+        self.definite: dict[str, int] = {}
+
+    def resolve(self, name: str):
+        if name in self.locals:
+            return LOCAL if self.kind != "module" else GLOBAL
+        scope = self.parent
+        while scope is not None:
+            if scope.kind == "function" and name in scope.locals:
+                return CLOSURE
+            if scope.kind == "module" and name in scope.locals:
+                return GLOBAL
+            scope = scope.parent
+        if hasattr(builtins, name):
+            return BUILTIN
+        return GLOBAL
+
+    def free_names(self):
+        "Names loaded in this scope (or nested scopes) that are not bound by it"
+        names = self.loads - self.locals
+        for child in self.children:
+            names |= child.free_names() - self.locals
+        return names
+
+    def descendants(self):
+        for child in self.children:
+            yield child
+            yield from child.descendants()
+
+    def module(self):
+        scope = self
+        while scope.parent is not None:
+            scope = scope.parent
+        return scope
+
+class SymbolTable:
+    def __init__(self, c_ast: list[Node]):
+        self.scopes: dict[int, Scope] = {}
+        self.root = Scope(None, None, "module")
+        self.conditional: set[str] = set() # module names bound inside an if
+        self.in_branch = False
+
+        counts = {}
+        for stmt in c_ast:
+            self.visit(stmt, self.root)
+            for name in self.bound_by(stmt):
+                counts[name] = counts.get(name, 0) + 1
+                self.root.definite.setdefault(name, stmt.lineno)
+        for name in list(self.root.definite):
+            if counts[name] > 1 or name in self.conditional:
+                del self.root.definite[name]
+
+    def bound_by(self, stmt: Node):
+        "Names an unconditional top-level statement binds"
+        if isinstance(stmt, (NodeFunc, NodeClassDef, NodeConstDef)):
+            return [stmt.name]
+        if isinstance(stmt, NodeAssign):
+            return [t.iden for t in stmt.targets if isinstance(t, NodeIden)]
+        if isinstance(stmt, NodeExpr) and isinstance(stmt.node, NodeImportRadon):
+            return [stmt.node.what[-1] if stmt.node.as_name is None else stmt.node.as_name]
+        return []
+
+    def scope_of(self, node: Node):
+        return self.scopes[id(node)]
+
+    def bind(self, name: str, scope: Scope):
+        scope.locals.add(name)
+        if scope.kind == "module" and self.in_branch:
+            self.conditional.add(name)
+
+    def visit(self, node, scope: Scope):
+        if isinstance(node, list):
+            for child in node:
+                self.visit(child, scope)
+        elif isinstance(node, dict):
+            for child in node.values():
+                self.visit(child, scope)
+        elif isinstance(node, NodeIden):
+            if node.context == "store":
+                self.bind(node.iden, scope)
+            else:
+                scope.loads.add(node.iden)
+        elif isinstance(node, NodeImportRadon):
+            self.bind(node.what[-1] if node.as_name is None else node.as_name, scope)
+        elif isinstance(node, NodeConstDef):
+            self.bind(node.name, scope)
+            self.visit(node.value, scope)
+        elif isinstance(node, (NodeFunc, NodeLambda)):
+            if isinstance(node, NodeFunc):
+                self.bind(node.name, scope)
+            # defaults and attributes are evaluated where the fn is defined
+            self.visit([arg.default for arg in node.args if isinstance(arg, KwArg)], scope)
+            self.visit(node.attrs, scope)
+            inner = Scope(node, scope, "function")
+            scope.children.append(inner)
+            self.scopes[id(node)] = inner
+            for arg in node.args:
+                inner.locals.add(arg.name)
+            self.visit(node.body, inner)
+        elif isinstance(node, NodeClassDef):
+            self.bind(node.name, scope)
+            self.visit(node.bases, scope)
+            self.visit(node.attrs, scope)
+            inner = Scope(node, scope, "class")
+            scope.children.append(inner)
+            self.scopes[id(node)] = inner
+            self.visit(node.body, inner)
+        elif isinstance(node, (NodeListComp, NodeSetComp, NodeGeneratorExp, NodeDictComp)):
+            # the first iterable is evaluated outside, everything else runs in the comprehension's own scope
+            self.visit(node.generators[0].iter, scope)
+            inner = Scope(node, scope, "function")
+            scope.children.append(inner)
+            self.scopes[id(node)] = inner
+            for i, generator in enumerate(node.generators):
+                if i > 0:
+                    self.visit(generator.iter, inner)
+                self.visit(generator.target, inner)
+                self.visit(generator.ifs, inner)
+            self.visit([node.key, node.value] if isinstance(node, NodeDictComp) else node.elt, inner)
+        elif isinstance(node, NodeIf):
+            self.visit(node.test, scope)
+            in_branch, self.in_branch = self.in_branch, True
+            self.visit(node.body, scope)
+            self.visit(node.orelse, scope)
+            self.in_branch = in_branch
+        elif isinstance(node, Node):
+            for child in vars(node).values():
+                self.visit(child, scope)
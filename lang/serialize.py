@@ -0,0 +1,281 @@
+# Compact binary encoding of the Radon AST (lang.nodes), for caches and for
+# handing parsed trees to other processes without re-parsing or pickling.
+#
+# Layout (little-endian):
+#   header   magic "RDNA", u16 version, u16 reserved, u32 string count, u32 node count, u32 root count
+#   u32 * (strings + 1)  offsets into the string blob (the last one is its end)
+#   u32 * nodes          offsets of each node's record in the node blob
+#   u32 * roots          indices of the top-level nodes
+#   string blob          UTF-8, every distinct string stored once
+#   node blob            per node: class name, lineno, col_offset, then its fields as values
+#
+# Inside the node blob every integer (string and node references, lengths, positions, int
+# constants) is a LEB128 varint, zigzag-encoded when signed. A value is a u8 tag followed by
+# its payload; child nodes are referenced by index, so the node table is flat and a node
+# can be decoded without touching the others.
+import enum
+import struct
+import sys
+from . import nodes
+
+MAGIC = b"RDNA"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHHIII")
+U32 = struct.Struct("<I")
+F64 = struct.Struct("<d")
+
+T_NONE, T_TRUE, T_FALSE, T_INT, T_BIGINT, T_FLOAT, T_STR, T_NODE, T_LIST, T_DICT, T_ENUM, T_FUNCARG = range(12)
+
+def write_varint(out: bytearray, n: int):
+    while n >= 0x80:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+
+def write_svarint(out: bytearray, n: int):
+    write_varint(out, (n << 1) if n >= 0 else ((-n << 1) - 1))
+
+def read_varint(buf: memoryview, offset: int):
+    n = shift = 0
+    while True:
+        b = buf[offset]
+        offset += 1
+        n |= (b & 0x7f) << shift
+        if b < 0x80:
+            return n, offset
+        shift += 7
+
+def read_svarint(buf: memoryview, offset: int):
+    n, offset = read_varint(buf, offset)
+    return (n >> 1) if not n & 1 else -((n + 1) >> 1), offset
+
+def u32_table(buf: memoryview, offset: int, count: int):
+    "The little-endian u32 table at offset: a view into buf where that's the native order, a tuple elsewhere"
+    if sys.byteorder == "little":
+        return buf[offset:offset + count * 4].cast("I")
+    return struct.unpack_from(f"<{count}I", buf, offset)
+
+def node_fields(cls):
+    return list(cls.__annotations__)
+
+class Writer:
+    def __init__(self):
+        self.strings: dict[str, int] = {}
+        self.records: list[bytes] = []
+        self.indices: dict[int, int] = {}
+
+    def string(self, s: str):
+        idx = self.strings.get(s)
+        if idx is None:
+            idx = self.strings[s] = len(self.strings)
+        return idx
+
+    def node(self, node: nodes.Node):
+        idx = self.indices.get(id(node))
+        if idx is not None:
+            return idx
+        out = bytearray()
+        write_varint(out, self.string(node.__class__.__name__))
+        write_svarint(out, node.lineno or 0)
+        write_svarint(out, node.col_offset or 0)
+        for field in node_fields(node.__class__):
+            self.value(getattr(node, field), out)
+        # children were appended while encoding the fields, so this node goes after them
+        idx = self.indices[id(node)] = len(self.records)
+        self.records.append(bytes(out))
+        return idx
+
+    def value(self, v, out: bytearray):
+        if v is None:
+            out.append(T_NONE)
+        elif v is True:
+            out.append(T_TRUE)
+        elif v is False:
+            out.append(T_FALSE)
+        elif isinstance(v, int) and not isinstance(v, enum.Enum):
+            if -2**63 <= v < 2**63:
+                out.append(T_INT)
+                write_svarint(out, v)
+            else:
+                out.append(T_BIGINT)
+                write_varint(out, self.string(str(v)))
+        elif isinstance(v, float):
+            out.append(T_FLOAT)
+            out += F64.pack(v)
+        elif isinstance(v, str):
+            out.append(T_STR)
+            write_varint(out, self.string(v))
+        elif isinstance(v, nodes.Node):
+            idx = self.node(v)
+            out.append(T_NODE)
+            write_varint(out, idx)
+        elif isinstance(v, (list, tuple)):
+            out.append(T_LIST)
+            write_varint(out, len(v))
+            for item in v:
+                self.value(item, out)
+        elif isinstance(v, dict):
+            out.append(T_DICT)
+            write_varint(out, len(v))
+            for key, item in v.items():
+                self.value(key, out)
+                self.value(item, out)
+        elif isinstance(v, enum.Enum):
+            out.append(T_ENUM)
+            write_varint(out, self.string(v.__class__.__name__))
+            write_varint(out, self.string(v.name))
+        elif isinstance(v, nodes.FuncArg):
+            out.append(T_FUNCARG)
+            write_varint(out, self.string(v.__class__.__name__))
+            write_varint(out, self.string(v.name))
+            self.value(getattr(v, "default", None), out)
+        else:
+            raise TypeError(f"cannot serialize {v!r} in a Radon AST")
+
+def dump(tree: list[nodes.Node]):
+    "Encodes a list of top-level nodes (as returned by Parser.run) into bytes"
+    w = Writer()
+    roots = [w.node(node) for node in tree]
+    blobs = [s.encode("utf-8") for s in w.strings]
+
+    out = bytearray(HEADER.pack(MAGIC, VERSION, 0, len(blobs), len(w.records), len(roots)))
+    offset = 0
+    for blob in blobs:
+        out += U32.pack(offset)
+        offset += len(blob)
+    out += U32.pack(offset)
+    offset = 0
+    for record in w.records:
+        out += U32.pack(offset)
+        offset += len(record)
+    for root in roots:
+        out += U32.pack(root)
+    for blob in blobs:
+        out += blob
+    for record in w.records:
+        out += record
+    return bytes(out)
+
+class ASTReader:
+    """
+    Reads an encoded AST straight out of a buffer (bytes, mmap, shared memory...) through a
+    memoryview. Nothing is decoded upfront: kind() and position() read a node's header in place,
+    and node() only materializes the requested subtree.
+    """
+    def __init__(self, buffer):
+        self.buf = memoryview(buffer).cast("B")
+        magic, version, _, n_strings, n_nodes, n_roots = HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC:
+            raise ValueError("not a serialized Radon AST")
+        if version != VERSION:
+            raise ValueError(f"unsupported Radon AST version {version} (expected {VERSION})")
+        self.n_strings = n_strings
+        self.n_nodes = n_nodes
+        self.string_offsets = u32_table(self.buf, HEADER.size, n_strings + 1)
+        start = HEADER.size + (n_strings + 1) * 4
+        self.node_offsets = u32_table(self.buf, start, n_nodes)
+        start += n_nodes * 4
+        self.roots = u32_table(self.buf, start, n_roots)
+        self.string_base = start + n_roots * 4
+        self.node_base = self.string_base + self.string_offsets[n_strings]
+        self._strings: dict[int, str] = {}
+        self._nodes: dict[int, nodes.Node] = {}
+        self._fields: dict[type, list[str]] = {}
+
+    def __len__(self):
+        return self.n_nodes
+
+    def string(self, idx: int):
+        s = self._strings.get(idx)
+        if s is None:
+            s = self._strings[idx] = str(self.buf[self.string_base + self.string_offsets[idx]:self.string_base + self.string_offsets[idx + 1]], "utf-8")
+        return s
+
+    def fields_of(self, cls):
+        fields = self._fields.get(cls)
+        if fields is None:
+            fields = self._fields[cls] = node_fields(cls)
+        return fields
+
+    def header(self, idx: int):
+        name, offset = read_varint(self.buf, self.node_base + self.node_offsets[idx])
+        lineno, offset = read_svarint(self.buf, offset)
+        col_offset, offset = read_svarint(self.buf, offset)
+        return self.string(name), lineno, col_offset, offset
+
+    def kind(self, idx: int):
+        return self.header(idx)[0]
+
+    def position(self, idx: int):
+        return self.header(idx)[1:3]
+
+    def node(self, idx: int):
+        node = self._nodes.get(idx)
+        if node is not None:
+            return node
+        name, lineno, col_offset, offset = self.header(idx)
+        cls = getattr(nodes, name, None)
+        if not (isinstance(cls, type) and issubclass(cls, nodes.Node)):
+            raise ValueError(f"unknown node type {name!r}")
+        fields = {}
+        for field in self.fields_of(cls):
+            fields[field], offset = self.value(offset)
+        fields["lineno"] = lineno
+        fields["col_offset"] = col_offset
+        # skips Node.__init__, which re-validates every argument
+        node = self._nodes[idx] = cls.__new__(cls)
+        node.__dict__.update(fields)
+        return node
+
+    def value(self, offset: int):
+        buf = self.buf
+        tag = buf[offset]
+        if tag <= T_FALSE:
+            return (None, True, False)[tag], offset + 1
+        if tag == T_FLOAT:
+            return F64.unpack_from(buf, offset + 1)[0], offset + 9
+        # every other payload starts with a varint, which is almost always a single byte
+        idx = buf[offset + 1]
+        offset += 2
+        if idx >= 0x80:
+            idx, offset = read_varint(buf, offset - 1)
+        if tag == T_NODE:
+            node = self._nodes.get(idx)
+            return (node if node is not None else self.node(idx)), offset
+        if tag == T_STR:
+            s = self._strings.get(idx)
+            return (s if s is not None else self.string(idx)), offset
+        if tag == T_LIST:
+            items = []
+            for _ in range(idx):
+                item, offset = self.value(offset)
+                items.append(item)
+            return items, offset
+        if tag == T_INT:
+            return (idx >> 1) if not idx & 1 else -((idx + 1) >> 1), offset
+        if tag == T_ENUM:
+            member, offset = read_varint(buf, offset)
+            return getattr(nodes, self.string(idx))[self.string(member)], offset
+        if tag == T_DICT:
+            items = {}
+            for _ in range(idx):
+                key, offset = self.value(offset)
+                items[key], offset = self.value(offset)
+            return items, offset
+        if tag == T_BIGINT:
+            return int(self.string(idx)), offset
+        if tag == T_FUNCARG:
+            cls = getattr(nodes, self.string(idx))
+            name, offset = read_varint(buf, offset)
+            name = self.string(name)
+            default, offset = self.value(offset)
+            return (cls(name, default) if cls is nodes.KwArg else cls(name)), offset
+        raise ValueError(f"corrupt Radon AST: unknown value tag {tag}")
+
+    def tree(self):
+        return [self.node(idx) for idx in self.roots]
+
+def load(data):
+    "Decodes bytes produced by dump() back into a list of top-level nodes"
+    return ASTReader(data).tree()
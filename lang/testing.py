@@ -0,0 +1,226 @@
+import contextlib
+import functools
+import importlib
+import importlib.util
+import io
+import marshal
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+import warnings
+import xml.etree.ElementTree as ET
+from lang.bootstrap import init, LazyModule, run_code, import_async
+from lang.bundle import compile_radon_file
+from lang.errors import RadonSyntaxError
+
+PASSED = "passed"
+FAILED = "failed"
+ERROR = "error"
+
+class TestResult:
+    def __init__(self, path: str, status: str, duration: float, message: str = "", output: str = ""):
+        self.path = path
+        self.status = status
+        self.duration = duration
+        self.message = message
+        self.output = output
+
+def discover(root: str):
+    "Finds every test_*.rad file under root, in a stable order"
+    if os.path.isfile(root):
+        return [root]
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.startswith("test_") and filename.endswith(".rad"):
+                found.append(os.path.join(dirpath, filename))
+    return found
+
+def shard(paths: list[str], index: int, count: int):
+    "Picks the index-th (1-based) of count interleaved slices, so every CI job gets a similar mix"
+    if not 1 <= index <= count:
+        raise ValueError(f"shard {index}/{count} is out of range")
+    return paths[index - 1::count]
+
+class CachedImporter:
+    # Compiled code of imported .rad modules is kept for the life of the worker,
+    # so helper modules shared by many tests are parsed only once. The modules
+    # themselves are re-executed for every test to keep tests isolated.
+    def __init__(self):
+        self.code = {}
+        self.registered = set() # names of the .rad modules put in sys.modules since the last reset()
+
+    def install(self, namespace: dict):
+        namespace["_global_radon_se_import"] = self.import_module
+        namespace["_global_radon_se_import_lazy"] = self.import_module_lazy
+        namespace["_global_radon_se_import_async"] = functools.partial(import_async, self.import_module)
+
+    def load_code(self, filename: str):
+        key = (filename, os.stat(filename).st_mtime_ns)
+        code = self.code.get(key)
+        if code is None:
+            code = self.code[key] = compile_radon_file(filename)[1]
+        return code
+
+    def import_module(self, names: list[str], as_name: str):
+        if as_name is None:
+            as_name = ".".join(names)
+        filename = "/".join(names) + ".rad"
+        try:
+            code = self.load_code(filename)
+        except FileNotFoundError:
+            return importlib.import_module(".".join(names), package=None)
+        spec = importlib.util.spec_from_loader(as_name, loader=None)
+        module = importlib.util.module_from_spec(spec)
+        self.install(module.__dict__)
+        sys.modules[as_name] = module
+        self.registered.add(as_name)
+        run_code(code, module.__dict__)
+        return module
+
+    def reset(self):
+        "Forgets the .rad modules imported so far, so the next test re-executes them; Python modules stay loaded"
+        for name in self.registered:
+            sys.modules.pop(name, None)
+        self.registered.clear()
+
+    def import_module_lazy(self, names: list[str], as_name: str):
+        return LazyModule(self.import_module, names, as_name)
+
+_importer = None
+
+def _worker_init():
+    global _importer
+    with warnings.catch_warnings():
+        # the parent process has already warned about anything missing
+        warnings.simplefilter("ignore")
+        init()
+    _importer = CachedImporter()
+
+def run_compiled(job: tuple[str, bytes]):
+    "Runs one compiled test file in a fresh namespace and reports how it went"
+    path, code = job
+    if _importer is None:
+        _worker_init()
+    namespace = {"__name__": "__main__", "__file__": path, "__builtins__": __builtins__}
+    _importer.install(namespace)
+    output = io.StringIO()
+    status, message = PASSED, ""
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            run_code(marshal.loads(code), namespace)
+    except AssertionError:
+        status, message = FAILED, traceback.format_exc()
+    except (Exception, SystemExit):
+        status, message = ERROR, traceback.format_exc()
+    duration = time.perf_counter() - start
+    # the Radon modules the test imported are thrown away, so the next test on this worker starts clean
+    _importer.reset()
+    return TestResult(path, status, duration, message, output.getvalue())
+
+def compile_tests(paths: list[str]):
+    "Compiles every test up front; files that don't compile are reported as errors right away"
+    jobs, results = [], []
+    for path in paths:
+        start = time.perf_counter()
+        try:
+            code = compile_radon_file(path)[1]
+        except RadonSyntaxError as e:
+            results.append(TestResult(path, ERROR, time.perf_counter() - start, f"{e.filename}:{e.lineno}:{e.offset}: SyntaxError: {e.msg}\n"))
+            continue
+        jobs.append((path, marshal.dumps(code)))
+    return jobs, results
+
+def run_tests(paths: list[str], jobs: int = 1, failfast: bool = False, report=None):
+    "Runs the given test files on `jobs` worker processes and returns their results in completion order"
+    compiled, results = compile_tests(paths)
+    for result in results:
+        if report is not None:
+            report(result)
+    if failfast and results:
+        return results
+    if jobs <= 1:
+        for job in compiled:
+            result = run_compiled(job)
+            results.append(result)
+            if report is not None:
+                report(result)
+            if failfast and result.status != PASSED:
+                break
+        return results
+    pool = multiprocessing.get_context("spawn").Pool(jobs, initializer=_worker_init)
+    try:
+        for result in pool.imap_unordered(run_compiled, compiled):
+            results.append(result)
+            if report is not None:
+                report(result)
+            if failfast and result.status != PASSED:
+                pool.terminate()
+                break
+        else:
+            pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+    return results
+
+def write_junit(results: list[TestResult], out, duration: float):
+    suite = ET.Element("testsuite", {
+        "name": "radon",
+        "tests": str(len(results)),
+        "failures": str(sum(r.status == FAILED for r in results)),
+        "errors": str(sum(r.status == ERROR for r in results)),
+        "time": f"{duration:.3f}",
+    })
+    for result in sorted(results, key=lambda r: r.path):
+        case = ET.SubElement(suite, "testcase", {
+            "classname": os.path.dirname(os.path.normpath(result.path)).replace(os.sep, ".") or "radon",
+            "name": os.path.basename(result.path),
+            "file": result.path,
+            "time": f"{result.duration:.3f}",
+        })
+        if result.status != PASSED:
+            lines = result.message.strip().splitlines()
+            element = ET.SubElement(case, "failure" if result.status == FAILED else "error", {"message": lines[-1] if lines else ""})
+            element.text = result.message
+        if result.output:
+            ET.SubElement(case, "system-out").text = result.output
+    ET.ElementTree(suite).write(out, encoding="unicode", xml_declaration=True)
+
+def main(root: str, jobs: int = 1, failfast: bool = False, shard_spec: str = None, junit_xml: str = None, slowest: int = 5):
+    paths = discover(root)
+    if shard_spec is not None:
+        index, count = map(int, shard_spec.split("/"))
+        paths = shard(paths, index, count)
+
+    def report(result: TestResult):
+        if result.status != PASSED:
+            sys.stderr.write(f"{result.status.upper()}: {result.path}\n{result.message}")
+            if result.output:
+                sys.stderr.write(f"--- output ---\n{result.output}")
+            sys.stderr.write("\n")
+            sys.stderr.flush()
+
+    start = time.perf_counter()
+    results = run_tests(paths, jobs, failfast, report)
+    duration = time.perf_counter() - start
+
+    if slowest and results:
+        print(f"slowest {min(slowest, len(results))} test(s):")
+        for result in sorted(results, key=lambda r: r.duration, reverse=True)[:slowest]:
+            print(f"  {result.duration:8.3f}s  {result.path}")
+    counts = {status: sum(r.status == status for r in results) for status in (PASSED, FAILED, ERROR)}
+    skipped = len(paths) - len(results)
+    summary = ", ".join(f"{n} {status}" for status, n in counts.items() if n)
+    if skipped:
+        summary += f", {skipped} not run"
+    print(f"{summary or 'no tests ran'} in {duration:.2f}s")
+
+    if junit_xml is not None:
+        with open(junit_xml, "w") as f:
+            write_junit(results, f, duration)
+    return 0 if results and counts[PASSED] == len(paths) else 1
@@ -1,10 +1,18 @@
 import ast
-import random
+import copy
+import hashlib
+import itertools
+import operator
+import os
+import threading
 from .nodes import *
+from .errors import RadonSyntaxError
+from .parser import Parser
+from .scope import Scope, SymbolTable, BUILTIN, GLOBAL
 
 class Context:
-    def __init__(self):
-        self.ctx_id = "".join([random.choice("0123456789abcdef") for _ in range(12)])
+    def __init__(self, ctx_id: str):
+        self.ctx_id = ctx_id
         self.ctr = 0
         self.preinit_statements = []
     
@@ -15,28 +23,204 @@ class Context:
     def add_preinit(self, stmt):
         self.preinit_statements.append(stmt)
 
+class InlineSubstitution(ast.NodeTransformer):
+    def __init__(self, mapping: dict[str, ast.expr]):
+        self.mapping = mapping
+    def visit_Name(self, node: ast.Name):
+        if isinstance(node.ctx, ast.Load) and node.id in self.mapping:
+            return copy.deepcopy(self.mapping[node.id])
+        return node
+
+def toplevel_nodes(node: ast.AST):
+    "Like ast.walk, but doesn't descend into function, lambda or class bodies"
+    for child in ast.iter_child_nodes(node):
+        if not isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+            yield child
+            yield from toplevel_nodes(child)
+
+class NotConstant(Exception):
+    pass
+
+CONST_TYPES = (int, float, str, bytes, bool, type(None))
+
+def is_const_value(value):
+    if isinstance(value, tuple):
+        return all(map(is_const_value, value))
+    return isinstance(value, CONST_TYPES)
+
+FOLD_BINOPS = {
+    BinOp.ADD: operator.add,
+    BinOp.SUB: operator.sub,
+    BinOp.MUL: operator.mul,
+    BinOp.DIV: operator.truediv,
+    BinOp.MOD: operator.mod,
+    BinOp.BIN_AND: operator.and_,
+    BinOp.BIN_OR: operator.or_,
+    BinOp.BIN_XOR: operator.xor,
+}
+FOLD_COMPARATORS = {
+    Comparator.EQ: operator.eq,
+    Comparator.NEQ: operator.ne,
+    Comparator.GT: operator.gt,
+    Comparator.LT: operator.lt,
+    Comparator.GTE: operator.ge,
+    Comparator.LTE: operator.le,
+}
+
+def module_level_nodes(node):
+    "Like nodes.walk, but doesn't descend into fns, lambdas or classes"
+    if isinstance(node, (NodeFunc, NodeLambda, NodeClassDef)):
+        return
+    if isinstance(node, (Node, FuncArg)):
+        if isinstance(node, Node):
+            yield node
+        node = list(vars(node).values())
+    elif isinstance(node, dict):
+        node = list(node.values())
+    if isinstance(node, list):
+        for child in node:
+            yield from module_level_nodes(child)
+
+class ModuleSummary:
+    "What modules importing a .rad module need to know about it when they're translated"
+    def __init__(self, constants: dict[str, Any], awaits: bool):
+        self.constants = constants
+        self.awaits = awaits # whether its body awaits, so it has to run on the event loop
+
+EMPTY_SUMMARY = ModuleSummary({}, False)
+
+# (filename, mtime) -> that module's summary, so a module imported from many places is only read once
+_module_summaries: dict[tuple[str, int], ModuleSummary] = {}
+_module_summaries_lock = threading.Lock()
+
+def module_summary(names: list[str], resolving: frozenset[str] = frozenset()):
+    """
+    The summary of the .rad module an import statement refers to, or an empty one if it's not a (valid) Radon module.
+    `resolving` holds the modules whose summaries are being computed further up, to stop on import cycles.
+    """
+    filename = "/".join(names) + ".rad"
+    if filename in resolving:
+        return EMPTY_SUMMARY
+    try:
+        key = (filename, os.stat(filename).st_mtime_ns)
+    except OSError:
+        return EMPTY_SUMMARY
+    with _module_summaries_lock:
+        summary = _module_summaries.get(key)
+    if summary is None:
+        # computed outside the lock; if two threads race here they compute the same summary
+        try:
+            translator = Translator(resolving | {filename})
+            c_ast = Parser(open(filename).read()).run()
+            summary = ModuleSummary(translator.collect_constants(c_ast), translator.awaits_at_module_level(c_ast))
+        except RadonSyntaxError:
+            # the import itself will report this when the module is loaded
+            summary = EMPTY_SUMMARY
+        with _module_summaries_lock:
+            summary = _module_summaries.setdefault(key, summary)
+    return summary
+
 class Translator:
-    def __init__(self):
+    def __init__(self, resolving: frozenset[str] = frozenset()):
         self.contexts: list[Context] = []
+        self.inline_fns: dict[str, NodeFunc] = {}
+        self.inlining: list[str] = []
+        self.scopes: list[Scope] = [] # symbol table scopes around the node being translated, innermost last; empty at module level
+        self.symbols: SymbolTable = None
+        self.comprehension_depth = 0
+        self.runtime_imports: set[str] = set()
+        self.regexes: dict[tuple[str, str], str] = {}
+        self.constants: dict[str, Any] = {}
+        self.const_modules: dict[str, dict[str, Any]] = {}
+        self.resolving = resolving
+        # per translator rather than random, so output is deterministic and nothing is shared between threads
+        self.context_ids = itertools.count(1)
 
     def run(self, c_ast: list[Node]):
-        self.contexts.append(Context())
+        self.contexts.append(self.new_context())
+        self.symbols = SymbolTable(c_ast)
+        self.collect_constants(c_ast)
+        self.collect_inline_fns(c_ast)
         body = list(map(self.visit, c_ast))
         v = ast.Module(self.contexts[-1].preinit_statements + body, type_ignores=[])
         self.contexts.pop()
+        if self.awaits_at_module_level(c_ast) or any(isinstance(node, ast.Await) for node in toplevel_nodes(v)):
+            self.await_imports(v)
         return v
+
+    def awaits_at_module_level(self, c_ast: list[Node]):
+        "Whether the module body awaits, either itself or by importing a module whose body does"
+        for node in module_level_nodes(c_ast):
+            if isinstance(node, NodeAwait):
+                return True
+            if isinstance(node, NodeImportRadon) and not self.process_importattrs(node.attrs)[0] and module_summary(node.what, self.resolving).awaits:
+                return True
+        return False
+
+    def await_imports(self, root: ast.Module | ast.AsyncFunctionDef):
+        """
+        In modules that await at the top level and in async fns, imports are awaited too, so that
+        imported modules with top-level await run on the same (already running) event loop
+        """
+        for node in toplevel_nodes(root):
+            if isinstance(node, ast.Assign) and isinstance(node.value, ast.Call) and isinstance(node.value.func, ast.Name) and node.value.func.id == "_global_radon_se_import":
+                node.value.func.id = "_global_radon_se_import_async"
+                node.value = ast.Await(node.value, lineno=node.lineno, col_offset=node.col_offset)
     
+    def new_context(self):
+        return Context(f"{next(self.context_ids):012x}")
+
+    def runtime_helper(self, module: str, name: str, node: Node):
+        "Imports a helper from lang.<module> once, at the top of the module being translated"
+        alias = f"_radon_{module}_{name}"
+        if alias not in self.runtime_imports:
+            self.runtime_imports.add(alias)
+            self.contexts[0].preinit_statements.insert(0, ast.ImportFrom(f"lang.{module}", [ast.alias(name, alias, lineno=node.lineno, col_offset=node.col_offset)], 0, lineno=node.lineno, col_offset=node.col_offset))
+        return ast.Name(alias, ast.Load(), lineno=node.lineno, col_offset=node.col_offset)
+
     def no_visitor(self, node: Node):
         raise NotImplementedError(f"Visitor for node {node} is not implemented!")
     def visit(self, node: Node):
         return getattr(self, "visit_" + node.__class__.__name__, self.no_visitor)(node)
     
     def visit_NodeCall(self, node: NodeCall):
+        if isinstance(node.called, NodeIden) and node.called.iden in self.inline_fns and not self.is_shadowed(node.called.iden):
+            return self.inline_call(node)
+        return self.plain_call(node)
+    def plain_call(self, node: NodeCall):
         return ast.Call(self.visit(node.called), list(map(self.visit, node.args)), [ast.keyword(arg=kw, value=self.visit(kw_val), lineno=node.lineno, col_offset=node.col_offset) for kw, kw_val in node.kwargs.items()], lineno=node.lineno, col_offset=node.col_offset)
     def visit_NodeIden(self, node: NodeIden):
+        if node.context == "load" and node.iden in self.constants and not self.is_shadowed(node.iden):
+            return ast.Constant(self.constants[node.iden], lineno=node.lineno, col_offset=node.col_offset)
+        if node.iden in ("True", "False", "None"):
+            # keywords in Python, so they can't be ast.Names
+            if node.context != "load":
+                raise RadonSyntaxError(f"cannot assign to {node.iden}", node.lineno, node.col_offset)
+            return ast.Constant({"True": True, "False": False, "None": None}[node.iden], lineno=node.lineno, col_offset=node.col_offset)
         return ast.Name(node.iden, ctx=ast.Load() if node.context == "load" else ast.Store(), lineno=node.lineno, col_offset=node.col_offset)
     def visit_NodeConst(self, node: NodeConst):
         return ast.Constant(node.value, lineno=node.lineno, col_offset=node.col_offset)
+    def visit_NodeFormatStr(self, node: NodeFormatStr):
+        return ast.JoinedStr(list(map(self.visit, node.values)), lineno=node.lineno, col_offset=node.col_offset)
+    def visit_NodeFormatValue(self, node: NodeFormatValue):
+        conversion = ord(node.conversion) if node.conversion is not None else -1
+        spec = ast.JoinedStr(list(map(self.visit, node.spec)), lineno=node.lineno, col_offset=node.col_offset) if node.spec is not None else None
+        return ast.FormattedValue(self.visit(node.value), conversion, spec, lineno=node.lineno, col_offset=node.col_offset)
+    def visit_NodeRegex(self, node: NodeRegex):
+        # every regex literal is compiled once, when the module is loaded, and identical ones share a pattern.
+        # The name comes from the literal itself, so code translated separately into one namespace
+        # (like REPL lines) can't rebind a name an earlier fn still refers to
+        key = (node.pattern, node.flags)
+        if key not in self.regexes:
+            if "_radon_re_compile" not in self.runtime_imports:
+                self.runtime_imports.add("_radon_re_compile")
+                self.contexts[0].preinit_statements.insert(0, ast.ImportFrom("re", [ast.alias("compile", "_radon_re_compile", lineno=node.lineno, col_offset=node.col_offset)], 0, lineno=node.lineno, col_offset=node.col_offset))
+            self.regexes[key] = f"_radon_regex_{hashlib.blake2b(repr(key).encode(), digest_size=8).hexdigest()}"
+            self.contexts[0].add_preinit(ast.Assign([ast.Name(self.regexes[key], ast.Store(), lineno=node.lineno, col_offset=node.col_offset)], ast.Call(
+                ast.Name("_radon_re_compile", ast.Load(), lineno=node.lineno, col_offset=node.col_offset),
+                [ast.Constant(node.pattern, lineno=node.lineno, col_offset=node.col_offset), ast.Constant(int(regex_flags(node.flags)), lineno=node.lineno, col_offset=node.col_offset)],
+                [], lineno=node.lineno, col_offset=node.col_offset), lineno=node.lineno, col_offset=node.col_offset))
+        return ast.Name(self.regexes[key], ast.Load(), lineno=node.lineno, col_offset=node.col_offset)
     def visit_NodeStmt(self, node: NodeStmt):
         return node.node
     def visit_NodeExpr(self, node: NodeExpr):
@@ -47,10 +231,79 @@ class Translator:
             BinOp.ADD: ast.Add(),
             BinOp.SUB: ast.Sub(),
             BinOp.MUL: ast.Mult(),
-            BinOp.DIV: ast.Div()
+            BinOp.DIV: ast.Div(),
+            BinOp.MOD: ast.Mod(),
+            BinOp.BIN_AND: ast.BitAnd(),
+            BinOp.BIN_OR: ast.BitOr(),
+            BinOp.BIN_XOR: ast.BitXor(),
         }[node.op], self.visit(node.right), lineno=node.lineno, col_offset=node.col_offset)
+    def visit_NodeUnaryOp(self, node: NodeUnaryOp):
+        return ast.UnaryOp({
+            UnaryOp.NOT: ast.Not(),
+            UnaryOp.POS: ast.UAdd(),
+            UnaryOp.NEG: ast.USub(),
+        }[node.op], self.visit(node.right), lineno=node.lineno, col_offset=node.col_offset)
+    def visit_NodeBoolOp(self, node: NodeBoolOp):
+        return ast.BoolOp(ast.And() if node.op == BoolOp.AND else ast.Or(), list(map(self.visit, node.values)), lineno=node.lineno, col_offset=node.col_offset)
     def visit_NodeClassDef(self, node: NodeClassDef):
-        return ast.ClassDef(name=node.name, bases=list(map(self.visit, node.bases)), keywords=[], body=list(map(self.visit, node.body)) if len(node.body) > 0 else [ast.Pass(lineno=node.lineno, col_offset=node.col_offset)], decorator_list=[], lineno=node.lineno, col_offset=node.col_offset)
+        attrs = self.process_classattrs(node.attrs)
+        bases = list(map(self.visit, node.bases))
+        self.scopes.append(self.symbols.scope_of(node))
+        body = list(map(self.visit, node.body)) if not attrs[0] else self.process_slots_body(node)
+        self.scopes.pop()
+        return ast.ClassDef(name=node.name, bases=bases, keywords=[], body=body if len(body) > 0 else [ast.Pass(lineno=node.lineno, col_offset=node.col_offset)], decorator_list=[], lineno=node.lineno, col_offset=node.col_offset)
+    def process_classattrs(self, attrs):
+        is_slots = False
+        for attr in attrs:
+            if isinstance(attr, NodeIden) and attr.iden == "slots":
+                is_slots = True
+            else:
+                raise RadonSyntaxError(f"unknown class attribute {attr}", attr.lineno, attr.col_offset)
+        return [is_slots]
+    def process_slots_body(self, node: NodeClassDef):
+        """
+        @slots classes are records: `name = default;` statements in the class body become fields
+        (with a generated __init__, or assigned first thing in the one defined), and every `self.name = ...` inside methods
+        gets a slot as well, so instances don't carry a __dict__.
+        """
+        fields = {}
+        slots = {}
+        body = []
+        init = None
+        for stmt in node.body:
+            if isinstance(stmt, NodeAssign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], NodeIden):
+                fields[stmt.targets[0].iden] = stmt.value
+                slots[stmt.targets[0].iden] = None
+                continue
+            if isinstance(stmt, NodeFunc):
+                if stmt.name == "__init__":
+                    init = len(body)
+                if len(stmt.args) > 0 and isinstance(stmt.args[0], PosArg):
+                    for n in walk(stmt.body):
+                        if isinstance(n, NodeAttr) and n.context == "store" and isinstance(n.left, NodeIden) and n.left.iden == stmt.args[0].name:
+                            slots[n.right] = None
+            body.append(self.visit(stmt))
+
+        ln, co = node.lineno, node.col_offset
+        if len(fields) > 0 and init is not None:
+            # the user's __init__ starts by assigning the defaults, which are evaluated once in the class body like
+            # the generated __init__'s; __class__ is the class being defined, whatever its name is bound to later
+            init = body[init]
+            if init.args.args:
+                instance = ast.Name(init.args.args[0].arg, ast.Load(), lineno=ln, col_offset=co)
+            elif init.args.vararg is not None:
+                instance = ast.Subscript(ast.Name(init.args.vararg.arg, ast.Load(), lineno=ln, col_offset=co), ast.Constant(0, lineno=ln, col_offset=co), ast.Load(), lineno=ln, col_offset=co)
+            else:
+                raise RadonSyntaxError(f"__init__ of @slots class '{node.name}' must take the instance as its first argument", init.lineno, init.col_offset)
+            body.insert(0, ast.Assign([ast.Name("_radon_slot_defaults", ast.Store(), lineno=ln, col_offset=co)], ast.Tuple([self.visit(x) for x in fields.values()], ast.Load(), lineno=ln, col_offset=co), lineno=ln, col_offset=co))
+            targets = [ast.Attribute(copy.deepcopy(instance), name, ast.Store(), lineno=ln, col_offset=co) for name in fields]
+            init.body.insert(0, ast.Assign([ast.Tuple(targets, ast.Store(), lineno=ln, col_offset=co)], ast.Attribute(ast.Name("__class__", ast.Load(), lineno=ln, col_offset=co), "_radon_slot_defaults", ast.Load(), lineno=ln, col_offset=co), lineno=ln, col_offset=co))
+        elif len(fields) > 0 and init is None:
+            init_args = ast.arguments([], [ast.arg("self", lineno=ln, col_offset=co), *(ast.arg(name, lineno=ln, col_offset=co) for name in fields)], None, [], [], None, [self.visit(x) for x in fields.values()])
+            init_body = [ast.Assign([ast.Attribute(ast.Name("self", ast.Load(), lineno=ln, col_offset=co), name, ast.Store(), lineno=ln, col_offset=co)], ast.Name(name, ast.Load(), lineno=ln, col_offset=co), lineno=ln, col_offset=co) for name in fields]
+            body.insert(0, ast.FunctionDef("__init__", init_args, init_body, [], type_params=[], lineno=ln, col_offset=co))
+        body.insert(0, ast.Assign([ast.Name("__slots__", ast.Store(), lineno=ln, col_offset=co)], ast.Constant(tuple(slots), lineno=ln, col_offset=co), lineno=ln, col_offset=co))
+        return body
     def visit_NodeCompare(self, node: NodeCompare):
         return ast.Compare(self.visit(node.left), [{
             Comparator.EQ: ast.Eq(),
@@ -61,7 +314,12 @@ class Translator:
             Comparator.LTE: ast.LtE(),
         }[node.op]], [self.visit(node.right)], lineno=node.lineno, col_offset=node.col_offset)
     def visit_NodeIf(self, node: NodeIf):
-        return ast.If(self.visit(node.test), list(map(self.visit, node.body)), list(map(self.visit, node.orelse)), lineno=node.lineno, col_offset=node.col_offset)
+        try:
+            # with a constant test, CPython drops the dead branch when compiling
+            test = ast.Constant(bool(self.fold(node.test)), lineno=node.test.lineno, col_offset=node.test.col_offset)
+        except NotConstant:
+            test = self.visit(node.test)
+        return ast.If(test, list(map(self.visit, node.body)), list(map(self.visit, node.orelse)), lineno=node.lineno, col_offset=node.col_offset)
 
     def process_func_body(self, body: list[Node]):
         if len(body) > 0:
@@ -83,14 +341,17 @@ class Translator:
         can_do_kwargs = True
         for arg in args:
             if isinstance(arg, PosArg):
-                assert can_do_posargs, "positional arguments cannot go after vararg / kwargs!"
+                if not can_do_posargs:
+                    raise RadonSyntaxError("positional arguments cannot go after vararg / kwargs!", node.lineno, node.col_offset)
                 posargs.append(ast.arg(arg=arg.name, lineno=node.lineno, col_offset=node.col_offset))
             elif isinstance(arg, PosVarArg):
-                assert vararg is None, "only 1 vararg is allowed!"
+                if vararg is not None:
+                    raise RadonSyntaxError("only 1 vararg is allowed!", node.lineno, node.col_offset)
                 vararg = ast.arg(arg=arg.name, lineno=node.lineno, col_offset=node.col_offset)
                 can_do_posargs = False
             elif isinstance(arg, KwArg):
-                assert can_do_kwargs, "kwargs cannot follow kw-vararg!"
+                if not can_do_kwargs:
+                    raise RadonSyntaxError("kwargs cannot follow kw-vararg!", node.lineno, node.col_offset)
                 if vararg is None:
                     posargs.append(ast.arg(arg=arg.name, lineno=node.lineno, col_offset=node.col_offset))
                     defaults.append(self.visit(arg.default))
@@ -99,7 +360,8 @@ class Translator:
                     kwdefaults.append(self.visit(arg.default))
                 can_do_posargs = False
             elif isinstance(arg, KwVarArg):
-                assert kwarg is None, "only 1 vararg is allowed!"
+                if kwarg is not None:
+                    raise RadonSyntaxError("only 1 vararg is allowed!", node.lineno, node.col_offset)
                 kwarg = ast.arg(arg=arg.name, lineno=node.lineno, col_offset=node.col_offset)
                 can_do_posargs = False
                 can_do_kwargs = False
@@ -113,26 +375,265 @@ class Translator:
         attrs, decos = self.process_fnattrs(node.attrs)
 
         fndef = ast.FunctionDef if not attrs[0] else ast.AsyncFunctionDef
+        if attrs[2] and self.inline_fns.get(node.name) is not node:
+            raise RadonSyntaxError(f"cannot inline '{node.name}': only module-level fns can be inlined", node.lineno, node.col_offset)
+
+        if attrs[4]:
+            self.check_vectorizable(node)
 
-        self.contexts.append(Context())
+        # defaults are evaluated where the fn is defined, outside of its scope
+        args = self.process_func_args(node, node.args)
+        self.contexts.append(self.new_context())
+        self.scopes.append(self.symbols.scope_of(node))
         body = self.process_func_body(node.body)
-        v = fndef(node.name, self.process_func_args(node, node.args), self.contexts[-1].preinit_statements + body, decos, type_params=[], lineno=node.lineno, col_offset=node.col_offset)
+        v = fndef(node.name, args, self.contexts[-1].preinit_statements + body, decos, type_params=[], lineno=node.lineno, col_offset=node.col_offset)
+        if attrs[3]:
+            self.bind_globals(node, v)
+        if attrs[0]:
+            self.await_imports(v)
+        self.scopes.pop()
         self.contexts.pop()
         return v
+
+    def bind_globals(self, node: NodeFunc | NodeLambda, fn: ast.FunctionDef | ast.AsyncFunctionDef):
+        """
+        @bindglobals: builtins and module globals the fn uses are bound as keyword-only defaults
+        (`_radon_bound_len=len`), so the body loads them with LOAD_FAST instead of LOAD_GLOBAL. The
+        parameters are renamed so callers can't pass them by accident, and `**kwargs` still gets
+        every keyword. Only names that certainly hold their final value when the fn is defined are
+        bound; lambdas are hoisted to the top of their scope, so they only get builtins. Fns nested
+        in this one keep loading the globals themselves.
+        """
+        scope = self.symbols.scope_of(node)
+        module = scope.module()
+        uses = [n for stmt in fn.body if not isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+                for n in itertools.chain([stmt], toplevel_nodes(stmt)) if isinstance(n, ast.Name)]
+        stored = {n.id for n in uses if not isinstance(n.ctx, ast.Load)}
+        bound = set()
+        for name in sorted(scope.free_names()):
+            kind = scope.resolve(name)
+            if scope.parent.kind == "class" and name in scope.parent.locals:
+                continue
+            if kind == GLOBAL and not (isinstance(node, NodeFunc) and module.definite.get(name, node.lineno) < node.lineno):
+                continue
+            if kind not in (BUILTIN, GLOBAL) or name in stored:
+                continue
+            bound.add(name)
+            fn.args.kwonlyargs.append(ast.arg(f"_radon_bound_{name}", lineno=node.lineno, col_offset=node.col_offset))
+            fn.args.kw_defaults.append(ast.Name(name, ast.Load(), lineno=node.lineno, col_offset=node.col_offset))
+        for n in uses:
+            if n.id in bound:
+                n.id = f"_radon_bound_{n.id}"
+
+    def check_vectorizable(self, node: NodeFunc | NodeLambda):
+        # control flow and short-circuiting don't broadcast over arrays, so only plain expressions are allowed
+        allowed = (NodeExpr, NodeAssign, NodeBinOp, NodeCompare, NodeIden, NodeConst, NodeAttr, NodeIndex, NodeSlice, NodeCall, NodeList, NodeTuple, NodeArray)
+        for n in walk(node.body):
+            # `!` is `not`, which doesn't broadcast either; negation does
+            if not isinstance(n, allowed) and not (isinstance(n, NodeUnaryOp) and n.op != UnaryOp.NOT):
+                raise RadonSyntaxError(f"@vectorize fns can only use arithmetic, comparisons and calls, not {n.__class__.__name__}", n.lineno, n.col_offset)
+
+    def comprehension_locals(self):
+        "Names bound by the comprehensions directly around the node being translated"
+        names = set()
+        for scope in reversed(self.scopes):
+            if not isinstance(scope.node, (NodeListComp, NodeSetComp, NodeGeneratorExp, NodeDictComp)):
+                break
+            names |= scope.locals
+        return names
+
+    def is_shadowed(self, name: str):
+        "Whether `name`, where it's being translated, is bound by an enclosing fn, lambda, comprehension or class body rather than the module"
+        for i, scope in enumerate(reversed(self.scopes)):
+            # like in Python, a class body's names aren't visible from the fns and comprehensions nested in it
+            if name in scope.locals and (scope.kind != "class" or i == 0):
+                return True
+        return False
+
+    def collect_constants(self, c_ast: list[Node]):
+        """
+        Evaluates the module's `const` declarations in order, along with the const tables of the
+        Radon modules it imports, so both can be inlined. Returns the module's own const table.
+        """
+        for stmt in c_ast:
+            if isinstance(stmt, NodeExpr) and isinstance(stmt.node, NodeImportRadon):
+                table = module_summary(stmt.node.what, self.resolving).constants
+                if table:
+                    self.const_modules[stmt.node.what[-1] if stmt.node.as_name is None else stmt.node.as_name] = table
+            elif isinstance(stmt, NodeConstDef):
+                if stmt.name in self.constants:
+                    raise RadonSyntaxError(f"const '{stmt.name}' is already defined", stmt.lineno, stmt.col_offset)
+                try:
+                    value = self.fold(stmt.value)
+                except NotConstant:
+                    raise RadonSyntaxError(f"const '{stmt.name}' must be a literal expression", stmt.value.lineno, stmt.value.col_offset) from None
+                if not is_const_value(value):
+                    raise RadonSyntaxError(f"const '{stmt.name}' must be immutable (a number, string, bool, None or tuple of those)", stmt.value.lineno, stmt.value.col_offset)
+                self.constants[stmt.name] = value
+        if self.symbols is not None:
+            for name in self.constants:
+                if name not in self.symbols.root.definite:
+                    stmt = next(stmt for stmt in c_ast if isinstance(stmt, NodeConstDef) and stmt.name == name)
+                    raise RadonSyntaxError(f"const '{name}' cannot be reassigned", stmt.lineno, stmt.col_offset)
+        return self.constants
+
+    def fold(self, node: Node):
+        "Evaluates a constant expression at translate time, raising NotConstant if it isn't one"
+        if isinstance(node, NodeConst):
+            return node.value
+        if isinstance(node, NodeIden) and node.context == "load":
+            if node.iden in self.constants and not self.is_shadowed(node.iden):
+                return self.constants[node.iden]
+            if node.iden in ("True", "False", "None"):
+                return {"True": True, "False": False, "None": None}[node.iden]
+        elif isinstance(node, NodeAttr) and node.context == "load" and isinstance(node.left, NodeIden):
+            table = self.const_modules.get(node.left.iden, {})
+            if node.right in table and not self.is_shadowed(node.left.iden):
+                return table[node.right]
+        elif isinstance(node, NodeTuple) and node.context == "load":
+            return tuple(map(self.fold, node.values))
+        elif isinstance(node, (NodeBinOp, NodeCompare)):
+            left, right = self.fold(node.left), self.fold(node.right)
+            try:
+                return (FOLD_BINOPS if isinstance(node, NodeBinOp) else FOLD_COMPARATORS)[node.op](left, right)
+            except Exception:
+                # e.g. division by zero, that's left to fail at runtime
+                raise NotConstant() from None
+        elif isinstance(node, NodeBoolOp):
+            value = self.fold(node.values[0])
+            for other in node.values[1:]:
+                if (node.op == BoolOp.AND) != bool(value):
+                    break
+                value = self.fold(other)
+            return value
+        elif isinstance(node, NodeUnaryOp):
+            value = self.fold(node.right)
+            try:
+                return {UnaryOp.NOT: operator.not_, UnaryOp.POS: operator.pos, UnaryOp.NEG: operator.neg}[node.op](value)
+            except Exception:
+                raise NotConstant() from None
+        raise NotConstant()
+
+    def collect_inline_fns(self, c_ast: list[Node]):
+        """
+        @inline fns get their body substituted at every call site in the module,
+        which is only done when that's indistinguishable from a real call
+        """
+        assigned = [n.iden for n in walk(c_ast) if isinstance(n, NodeIden) and n.context == "store"]
+        defined = [n.name for n in c_ast if isinstance(n, NodeFunc)]
+        for fn in c_ast:
+            if not isinstance(fn, NodeFunc) or not any(isinstance(attr, NodeIden) and attr.iden == "inline" for attr in fn.attrs):
+                continue
+            def refuse(reason):
+                raise RadonSyntaxError(f"cannot inline '{fn.name}': {reason}", fn.lineno, fn.col_offset)
+            if len(fn.body) != 1 or not isinstance(fn.body[0], NodeExpr):
+                refuse("body must be a single expression")
+            if not all(type(arg) is PosArg for arg in fn.args):
+                refuse("only plain positional arguments are supported")
+            if any(isinstance(attr, NodeIden) and attr.iden == "async" for attr in fn.attrs):
+                refuse("async fns cannot be inlined")
+            if fn.name in assigned or defined.count(fn.name) > 1:
+                refuse("the name is rebound elsewhere in the module")
+            for n in walk(fn.body):
+                if isinstance(n, (NodeLambda, NodeAwait, NodeImportRadon)):
+                    refuse("lambdas, await and imports cannot be inlined")
+                if isinstance(n, NodeIden) and n.iden == fn.name:
+                    refuse("recursive fns cannot be inlined")
+            self.inline_fns[fn.name] = fn
+
+    def inline_call(self, node: NodeCall):
+        fn = self.inline_fns[node.called.iden]
+        def refuse(reason):
+            raise RadonSyntaxError(f"cannot inline call to '{fn.name}': {reason}", node.lineno, node.col_offset)
+        if fn.name in self.inlining:
+            refuse("inline fns call each other recursively")
+        params = [arg.name for arg in fn.args]
+        passed = list(zip(params, node.args)) + list(node.kwargs.items())
+        if len(node.args) > len(params) or sorted(name for name, _ in passed) != sorted(params):
+            refuse(f"expected arguments {', '.join(params)}")
+
+        # arguments are evaluated once, left to right, exactly like for a real call:
+        # names and constants are substituted directly, everything else goes through a walrus
+        # (which isn't allowed everywhere inside comprehensions, so those keep the call)
+        if self.comprehension_depth > 0 and not all(isinstance(x, (NodeIden, NodeConst)) for x in [*node.args, *node.kwargs.values()]):
+            return self.plain_call(node)
+        # the body runs in the caller's scope instead of its own, so everything it loads from the
+        # module must mean the same there, and comprehensions and lambdas in it must not bind a
+        # parameter or a name passed as an argument (substitution would replace the parameter
+        # inside them, or the argument would be captured); otherwise it's just called
+        scope = self.symbols.scope_of(fn)
+        if any(self.is_shadowed(name) for name in self.inline_free_names(fn)):
+            return self.plain_call(node)
+        passed_names = {value.iden for _, value in passed if isinstance(value, NodeIden)}
+        if (set(params) | passed_names) & self.inline_local_names(fn):
+            return self.plain_call(node)
+        mapping = {}
+        prelude = []
+        for name, value in passed:
+            value = self.visit(value)
+            if isinstance(value, (ast.Name, ast.Constant)):
+                mapping[name] = value
+            else:
+                tmp = self.contexts[-1].get_unique_name()
+                prelude.append(ast.NamedExpr(ast.Name(tmp, ast.Store(), lineno=node.lineno, col_offset=node.col_offset), value, lineno=node.lineno, col_offset=node.col_offset))
+                mapping[name] = ast.Name(tmp, ast.Load(), lineno=node.lineno, col_offset=node.col_offset)
+
+        self.inlining.append(fn.name)
+        saved_scopes, self.scopes = self.scopes, [scope]
+        body = InlineSubstitution(mapping).visit(self.visit(fn.body[0].node))
+        self.scopes = saved_scopes
+        self.inlining.pop()
+
+        if len(prelude) == 0:
+            return body
+        return ast.Subscript(ast.Tuple(prelude + [body], ast.Load(), lineno=node.lineno, col_offset=node.col_offset), ast.Constant(-1, lineno=node.lineno, col_offset=node.col_offset), ast.Load(), lineno=node.lineno, col_offset=node.col_offset)
     
+    def inline_free_names(self, fn: NodeFunc, seen: set[str] | None = None):
+        "Module-level names the body of an inline fn uses, including through the inline fns it calls"
+        seen = seen if seen is not None else set()
+        seen.add(fn.name)
+        names = self.symbols.scope_of(fn).free_names()
+        for name in list(names):
+            if name in self.inline_fns and name not in seen:
+                names |= self.inline_free_names(self.inline_fns[name], seen)
+        return names
+
+    def inline_local_names(self, fn: NodeFunc, seen: set[str] | None = None):
+        "Names bound by the comprehensions and lambdas in the body of an inline fn, including in the inline fns it calls"
+        seen = seen if seen is not None else set()
+        seen.add(fn.name)
+        scope = self.symbols.scope_of(fn)
+        names = set().union(*(child.locals for child in scope.descendants()))
+        for name in scope.free_names():
+            if name in self.inline_fns and name not in seen:
+                names |= self.inline_local_names(self.inline_fns[name], seen)
+        return names
+
     def process_fnattrs(self, attrs):
         is_async = False
         custom_name = None
+        is_inline = False
+        bind_globals = False
+        vectorize = None
         rest = []
         for attr in attrs:
             if isinstance(attr, NodeIden) and attr.iden == "async":
                 is_async = True
+            elif isinstance(attr, NodeIden) and attr.iden == "inline":
+                is_inline = True
+            elif isinstance(attr, NodeIden) and attr.iden == "bindglobals":
+                bind_globals = True
+            elif isinstance(attr, NodeIden) and attr.iden == "vectorize":
+                vectorize = self.runtime_helper("vector", "vectorize", attr)
             elif isinstance(attr, NodeCall) and isinstance(attr.called, NodeIden) and attr.called.iden == "def":
-                assert len(attr.args) == 1 and isinstance(attr.args[0], NodeConst) and isinstance(attr.args[0].value, str), "@def('...') expected"
+                if not (len(attr.args) == 1 and isinstance(attr.args[0], NodeConst) and isinstance(attr.args[0].value, str)):
+                    raise RadonSyntaxError("@def('...') expected", attr.lineno, attr.col_offset)
                 custom_name = attr.args[0].value
             else:
                 rest.append(self.visit(attr))
-        return [is_async, custom_name], rest
+        if vectorize is not None:
+            rest.append(vectorize)
+        return [is_async, custom_name, is_inline, bind_globals, vectorize is not None], rest
 
     def visit_NodeLambda(self, node: NodeFunc):
         """
@@ -143,36 +644,113 @@ class Translator:
 
         fndef = ast.FunctionDef if not attrs[0] else ast.AsyncFunctionDef
         name = (self.contexts[-1].get_unique_name()) if attrs[1] is None else attrs[1]
+        if attrs[2]:
+            raise RadonSyntaxError("cannot inline a lambda, only module-level fns", node.lineno, node.col_offset)
 
-        v = fndef(name, self.process_func_args(node, node.args), self.process_func_body(node.body), decorator_list=decos, type_params=[], lineno=node.lineno, col_offset=node.col_offset)
+        if attrs[4]:
+            self.check_vectorizable(node)
 
-        for deco in decos:
-            v = ast.Call(self.visit(deco), [v], [], lineno=node.lineno, col_offset=node.col_offset)
+        # nested lambdas are hoisted into this lambda's body, so they can close over its arguments
+        # defaults are evaluated where the fn is defined, outside of its scope
+        args = self.process_func_args(node, node.args)
+        defaults = [n.iden for arg in node.args if isinstance(arg, KwArg) for n in walk(arg.default) if isinstance(n, NodeIden)]
+        captured = sorted((self.symbols.scope_of(node).free_names() | set(defaults)) & self.comprehension_locals())
+        self.contexts.append(self.new_context())
+        self.scopes.append(self.symbols.scope_of(node))
+        body = self.process_func_body(node.body)
+        v = fndef(name, args, self.contexts[-1].preinit_statements + body, decorator_list=decos, type_params=[], lineno=node.lineno, col_offset=node.col_offset)
+        if attrs[3]:
+            self.bind_globals(node, v)
+        if attrs[0]:
+            self.await_imports(v)
+        self.scopes.pop()
+        self.contexts.pop()
+
+        ln, co = node.lineno, node.col_offset
+        if captured:
+            # the variables of the comprehensions around the lambda don't exist where it's hoisted to, so it's
+            # hoisted inside a factory that takes them instead, and every item gets a lambda bound to its own values
+            factory = self.contexts[-1].get_unique_name()
+            self.contexts[-1].add_preinit(ast.FunctionDef(factory, ast.arguments([], [ast.arg(x, lineno=ln, col_offset=co) for x in captured], None, [], [], None, []), [
+                v, ast.Return(ast.Name(name, ast.Load(), lineno=ln, col_offset=co), lineno=ln, col_offset=co)
+            ], [], type_params=[], lineno=ln, col_offset=co))
+            return ast.Call(ast.Name(factory, ast.Load(), lineno=ln, col_offset=co), [ast.Name(x, ast.Load(), lineno=ln, col_offset=co) for x in captured], [], lineno=ln, col_offset=co)
         self.contexts[-1].add_preinit(v)
-        return ast.Name(name, ast.Load(), lineno=node.lineno, col_offset=node.col_offset)
+        return ast.Name(name, ast.Load(), lineno=ln, col_offset=co)
     def visit_NodeReturn(self, node: NodeReturn):
         return ast.Return(self.visit(node.value), lineno=node.lineno, col_offset=node.col_offset)
     def visit_NodeList(self, node: NodeList):
         return ast.List(list(map(self.visit, node.values)), ctx=ast.Load() if node.context == "load" else ast.Store(), lineno=node.lineno, col_offset=node.col_offset)
+    def visit_NodeTuple(self, node: NodeTuple):
+        return ast.Tuple(list(map(self.visit, node.values)), ctx=ast.Load() if node.context == "load" else ast.Store(), lineno=node.lineno, col_offset=node.col_offset)
+    def comprehension(self, node: NodeListComp | NodeSetComp | NodeGeneratorExp | NodeDictComp, elts: list[Node]):
+        "Translates the generators and elements of a comprehension; the first iterable is evaluated outside of its scope"
+        first_iter = self.visit(node.generators[0].iter)
+        self.comprehension_depth += 1
+        self.scopes.append(self.symbols.scope_of(node))
+        generators = [ast.comprehension(self.visit(g.target), first_iter if i == 0 else self.visit(g.iter), list(map(self.visit, g.ifs)), 0) for i, g in enumerate(node.generators)]
+        elts = list(map(self.visit, elts))
+        self.scopes.pop()
+        self.comprehension_depth -= 1
+        return elts, generators
+    def visit_NodeListComp(self, node: NodeListComp):
+        (elt,), generators = self.comprehension(node, [node.elt])
+        return ast.ListComp(elt, generators, lineno=node.lineno, col_offset=node.col_offset)
+    def visit_NodeSetComp(self, node: NodeSetComp):
+        (elt,), generators = self.comprehension(node, [node.elt])
+        return ast.SetComp(elt, generators, lineno=node.lineno, col_offset=node.col_offset)
+    def visit_NodeGeneratorExp(self, node: NodeGeneratorExp):
+        (elt,), generators = self.comprehension(node, [node.elt])
+        return ast.GeneratorExp(elt, generators, lineno=node.lineno, col_offset=node.col_offset)
+    def visit_NodeDictComp(self, node: NodeDictComp):
+        (key, value), generators = self.comprehension(node, [node.key, node.value])
+        return ast.DictComp(key, value, generators, lineno=node.lineno, col_offset=node.col_offset)
+    def visit_NodeArray(self, node: NodeArray):
+        return ast.Call(self.runtime_helper("vector", "array", node), [self.visit(node.value)], [], lineno=node.lineno, col_offset=node.col_offset)
     def visit_NodeDict(self, node: NodeDict):
         return ast.Dict(list(map(self.visit, node.keys)), list(map(self.visit, node.values)), lineno=node.lineno, col_offset=node.col_offset)
+    def make_tuple(self, node: Node, elts: list[ast.expr]):
+        # static parts are folded into a single constant, so they're built once at compile time
+        if all(isinstance(x, ast.Constant) for x in elts):
+            return ast.Constant(tuple(x.value for x in elts), lineno=node.lineno, col_offset=node.col_offset)
+        return ast.Tuple(elts, ctx=ast.Load(), lineno=node.lineno, col_offset=node.col_offset)
+    def visit_NodeXml(self, node: NodeXml):
+        attrs = [self.make_tuple(node, [self.visit(k), self.visit(v)]) for k, v in zip(node.attrkeys, node.attrvalues)]
+        return self.make_tuple(node, [ast.Constant(node.tag, lineno=node.lineno, col_offset=node.col_offset), self.make_tuple(node, attrs), *map(self.visit, node.children)])
     def visit_NodeAttr(self, node: NodeAttr):
+        if node.context == "load" and isinstance(node.left, NodeIden) and node.right in self.const_modules.get(node.left.iden, {}) and not self.is_shadowed(node.left.iden):
+            return ast.Constant(self.const_modules[node.left.iden][node.right], lineno=node.lineno, col_offset=node.col_offset)
         return ast.Attribute(self.visit(node.left), node.right, ctx=ast.Load() if node.context == "load" else ast.Store(), lineno=node.lineno, col_offset=node.col_offset)
     def visit_NodePipe(self, node: NodePipe):
-        call_node = node.right
+        # the piped value goes into a copy of the call, the input AST is never modified
+        call_node = copy.copy(node.right)
         if node.is_first:
-            call_node.args.insert(0, node.left)
+            call_node.args = [node.left] + node.right.args
         else:
-            call_node.args.append(node.left)
+            call_node.args = node.right.args + [node.left]
         return self.visit(call_node)
     def visit_NodeAssign(self, node: NodeAssign):
         return ast.Assign(list(map(self.visit, node.targets)), value=self.visit(node.value), lineno=node.lineno, col_offset=node.col_offset)
+    def visit_NodeConstDef(self, node: NodeConstDef):
+        # the global is still assigned, so the value can be read at runtime like any other
+        return ast.Assign([ast.Name(node.name, ast.Store(), lineno=node.lineno, col_offset=node.col_offset)], ast.Constant(self.constants[node.name], lineno=node.lineno, col_offset=node.col_offset), lineno=node.lineno, col_offset=node.col_offset)
     def visit_NodeAwait(self, node: NodeAwait):
         return ast.Await(self.visit(node.value), lineno=node.lineno, col_offset=node.col_offset)
     def visit_NodeIndex(self, node: NodeIndex):
         return ast.Subscript(self.visit(node.left), self.visit(node.index), ctx=ast.Load() if node.context == "load" else ast.Store(), lineno=node.lineno, col_offset=node.col_offset)
+    def process_importattrs(self, attrs):
+        is_lazy = False
+        for attr in attrs:
+            if isinstance(attr, NodeIden) and attr.iden == "lazy":
+                is_lazy = True
+            else:
+                raise RadonSyntaxError(f"unknown import attribute {attr}", attr.lineno, attr.col_offset)
+        return [is_lazy]
+
     def visit_NodeImportRadon(self, node: NodeImportRadon):
-        call = ast.Call(ast.Name("_global_radon_se_import", ctx=ast.Load(), lineno=node.lineno, col_offset=node.col_offset), [
+        attrs = self.process_importattrs(node.attrs)
+        importer = "_global_radon_se_import" if not attrs[0] else "_global_radon_se_import_lazy"
+        call = ast.Call(ast.Name(importer, ctx=ast.Load(), lineno=node.lineno, col_offset=node.col_offset), [
             ast.List(list(ast.Constant(x, lineno=node.lineno, col_offset=node.col_offset) for x in node.what), ctx=ast.Load(), lineno=node.lineno, col_offset=node.col_offset),
             ast.Constant(node.as_name, lineno=node.lineno, col_offset=node.col_offset)
         ], [], lineno=node.lineno, col_offset=node.col_offset)
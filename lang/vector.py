@@ -0,0 +1,95 @@
+# Array support for #[...] literals and @vectorize fns. Backed by NumPy when
+# it's installed; otherwise ListArray provides the same elementwise semantics
+# in pure Python (correct, but without the speedup).
+import functools
+import operator
+
+try:
+    import numpy
+except ImportError as e:
+    if e.name != "numpy":
+        raise e from None
+    numpy = None
+    import warnings
+    warnings.warn(RuntimeWarning("Could not import numpy. Arrays will fall back to a slow pure-Python implementation."))
+
+def _ndim(value):
+    n = 0
+    while isinstance(value, (list, tuple)):
+        n += 1
+        if not value:
+            break
+        value = value[0]
+    return n
+
+def _broadcast(fn, *args):
+    """
+    Applies fn to the scalars at matching positions of its (possibly nested) list arguments. Like
+    NumPy, arguments with fewer dimensions are repeated along the leading dimensions of the others.
+    """
+    ndims = [_ndim(arg) for arg in args]
+    top = max(ndims)
+    if top == 0:
+        return fn(*args)
+    lengths = {len(arg) for arg, n in zip(args, ndims) if n == top}
+    if len(lengths) > 1:
+        raise ValueError(f"operands could not be broadcast together with lengths {', '.join(map(str, sorted(lengths)))}")
+    return ListArray(_broadcast(fn, *(arg[i] if n == top else arg for arg, n in zip(args, ndims))) for i in range(lengths.pop()))
+
+def _elementwise(op, reflected=False):
+    def method(self, other):
+        return _broadcast(op, other, self) if reflected else _broadcast(op, self, other)
+    return method
+
+def _unary(op):
+    def method(self):
+        return _broadcast(op, self)
+    return method
+
+class ListArray(list):
+    "Stand-in for numpy.ndarray: arithmetic and comparisons apply elementwise, scalars broadcast"
+    __add__ = _elementwise(operator.add)
+    __radd__ = _elementwise(operator.add, True)
+    __sub__ = _elementwise(operator.sub)
+    __rsub__ = _elementwise(operator.sub, True)
+    __mul__ = _elementwise(operator.mul)
+    __rmul__ = _elementwise(operator.mul, True)
+    __truediv__ = _elementwise(operator.truediv)
+    __rtruediv__ = _elementwise(operator.truediv, True)
+    __mod__ = _elementwise(operator.mod)
+    __rmod__ = _elementwise(operator.mod, True)
+    __and__ = _elementwise(operator.and_)
+    __rand__ = _elementwise(operator.and_, True)
+    __or__ = _elementwise(operator.or_)
+    __ror__ = _elementwise(operator.or_, True)
+    __xor__ = _elementwise(operator.xor)
+    __rxor__ = _elementwise(operator.xor, True)
+    __eq__ = _elementwise(operator.eq)
+    __ne__ = _elementwise(operator.ne)
+    __lt__ = _elementwise(operator.lt)
+    __le__ = _elementwise(operator.le)
+    __gt__ = _elementwise(operator.gt)
+    __ge__ = _elementwise(operator.ge)
+    __neg__ = _unary(operator.neg)
+    __pos__ = _unary(operator.pos)
+    __hash__ = None
+
+def array(values):
+    if numpy is not None:
+        return numpy.asarray(values)
+    # nested lists become nested ListArrays, so each row is an array too
+    return ListArray(array(x) if isinstance(x, (list, tuple)) else x for x in values)
+
+def vectorize(fn):
+    """
+    Lets a fn written for scalars take arrays. With NumPy the fn body runs once on whole arrays;
+    without it, the fn is applied element by element, broadcasting scalar arguments.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args):
+        if not any(isinstance(arg, (list, tuple)) or (numpy is not None and isinstance(arg, numpy.ndarray)) for arg in args):
+            return fn(*args)
+        if numpy is not None:
+            return fn(*(numpy.asarray(arg) if isinstance(arg, (list, tuple)) else arg for arg in args))
+        return _broadcast(fn, *args)
+    return wrapper
@@ -0,0 +1,39 @@
+# Renderer for XML literals. A literal like <a href="x">text</a> evaluates to
+# ("a", (("href", "x"),), "text"), i.e. (tag, attribute pairs, *children).
+from html import escape
+
+def iter_render(tree):
+    stack = [iter((tree,))]
+    tags = []
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, (tuple, list)):
+                tag, attrs, *children = item
+                if isinstance(attrs, dict):
+                    attrs = attrs.items()
+                yield f"<{tag}" + "".join(f' {k}="{escape(str(v))}"' for k, v in attrs) + ">"
+                stack.append(iter(children))
+                tags.append(tag)
+                break
+            yield escape(str(item), quote=False)
+        else:
+            stack.pop()
+            if tags:
+                yield f"</{tags.pop()}>"
+
+def render(tree, out, chunk_size: int = 8192):
+    "Streams the rendered tree into a file-like object, in chunks of roughly chunk_size characters"
+    buf = []
+    size = 0
+    for piece in iter_render(tree):
+        buf.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            out.write("".join(buf))
+            buf.clear()
+            size = 0
+    if buf:
+        out.write("".join(buf))
+
+def render_string(tree):
+    return "".join(iter_render(tree))
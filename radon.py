@@ -1,45 +1,81 @@
 import sys
 import io
+import importlib
 import ast as pythonast
 import traceback
 from lang.parser import Parser
 from lang.translator import Translator
+from lang.errors import RadonSyntaxError
 
 VER = (0, 1)
 SVER = ".".join(map(str, VER))
 
-def format_syntaxerr(source, parser, filename, e):
+def format_syntaxerr(source, filename, e):
     lines = source.split('\n')
-    line = parser.tok.line if parser.tok.line != -1 else len(lines)
-    coloffset = parser.tok.offset if parser.tok.line != -1 else len(lines[-1])
     n = ""
-    n += (f"  File {repr(filename)}, line {line}\n")
-    n += (f"    {lines[line - 1]}\n")
-    n += (f"    {' ' * (coloffset-1)}^\n")
-    n += f"SyntaxError: " + ", ".join(map(repr, e.args))
-    return n
+    for error in e.errors:
+        line = min(max(error.lineno or len(lines), 1), len(lines))
+        coloffset = max(error.offset or 1, 1)
+        n += (f"  File {repr(filename)}, line {line}\n")
+        n += (f"    {lines[line - 1]}\n")
+        n += (f"    {' ' * (coloffset-1)}^\n")
+        n += f"SyntaxError: {error.msg}\n"
+    return n.rstrip("\n")
 
 import lang.runtime
+from lang.bootstrap import COMPILE_FLAGS, run_code, set_loop_factory
 lang.runtime.init()
 
-globals()["_global_radon_se_import"] = lang.runtime.import_module_generic
+lang.runtime.install(globals())
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
+    if "--loop-factory" in sys.argv:
+        # e.g. --loop-factory uvloop:new_event_loop
+        module, _, factory = sys.argv[sys.argv.index("--loop-factory") + 1].partition(":")
+        set_loop_factory(getattr(importlib.import_module(module), factory or "new_event_loop"))
+    if "--test" in sys.argv:
+        from lang.testing import main as run_tests
+        option = lambda name, default=None: sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+        exit(run_tests(
+            option("--test"),
+            jobs=int(option("-j", 1)),
+            failfast="--failfast" in sys.argv,
+            shard_spec=option("--shard"),
+            junit_xml=option("--junit-xml"),
+            slowest=int(option("--slowest", 5)),
+        ))
+    elif "--bundle" in sys.argv:
+        from lang.bundle import build_bundle
+        entry = sys.argv[sys.argv.index("--bundle") + 1]
+        output = sys.argv[sys.argv.index("-o") + 1] if "-o" in sys.argv else entry.rsplit(".", 1)[0] + ".pyz"
+        try:
+            modules = build_bundle(entry, output)
+        except RadonSyntaxError as e:
+            sys.stderr.write(format_syntaxerr(open(e.filename).read(), e.filename, e))
+            sys.stderr.write("\n")
+            sys.stderr.flush()
+            exit(1)
+        print(f"Bundled {len(modules)} module(s) into {output}")
+    elif len(sys.argv) > 1:
         try:
             source = (open(sys.argv[1]).read())
             parser = Parser(source)
             ast = parser.run()
-        except AssertionError as e:
-            sys.stderr.write(format_syntaxerr(source, parser, sys.argv[1], e))
+            pyast = Translator().run(ast)
+        except RadonSyntaxError as e:
+            sys.stderr.write(format_syntaxerr(source, sys.argv[1], e))
             sys.stderr.write("\n")
             sys.stderr.flush()
             exit(1)
 
-        pyast = Translator().run(ast)
         if "--debug-radon-unparse" not in sys.argv:
+            profiler = None
+            if "--profile" in sys.argv:
+                from lang.profiler import Sampler
+                profiler = Sampler()
+                profiler.start()
             try:
-                exec(compile(pyast, sys.argv[1], "exec"))
+                run_code(compile(pyast, sys.argv[1], "exec", flags=COMPILE_FLAGS), globals())
             except:
                 # this omits the bottom stack frame
                 # otherwise it looks something like this:
@@ -59,6 +95,13 @@ if __name__ == "__main__":
                 #sys.stderr.flush()
                 traceback.print_exc()
                 exit(1)
+            finally:
+                if profiler is not None:
+                    profiler.stop()
+                    profiler.report(sys.stderr)
+                    if "--profile-out" in sys.argv:
+                        with open(sys.argv[sys.argv.index("--profile-out") + 1], "w") as f:
+                            profiler.write_collapsed(f)
         else:
             print(pythonast.unparse(pyast))
     else:
@@ -73,19 +116,19 @@ if __name__ == "__main__":
             try:
                 parser = Parser(src)
                 ast = parser.run()
-            except AssertionError as e:
-                print(format_syntaxerr(src, parser, "<stdin>", e))
+                pyast = Translator().run(ast)
+            except RadonSyntaxError as e:
+                print(format_syntaxerr(src, "<stdin>", e))
                 continue
-            pyast = Translator().run(ast)
             try:
                 if len(pyast.body) > 1:
-                    exec(compile(pyast, "<stdin>", "exec"))
+                    run_code(compile(pyast, "<stdin>", "exec", flags=COMPILE_FLAGS), globals())
                 else:
                     if isinstance(pyast.body[0], pythonast.Expr):
-                        if (rv := eval(compile(pythonast.Expression(pyast.body[0].value), "<stdin>", "eval"))) is not None:
+                        if (rv := run_code(compile(pythonast.Expression(pyast.body[0].value), "<stdin>", "eval", flags=COMPILE_FLAGS), globals())) is not None:
                             print(repr(rv))
                     else:
-                        exec(compile(pyast, "<stdin>", "exec"))
+                        run_code(compile(pyast, "<stdin>", "exec", flags=COMPILE_FLAGS), globals())
             except:
                 # TODO: same thing over there
                 #x = io.StringIO()
@@ -0,0 +1,10 @@
+import os
+import sys
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+warnings.simplefilter("ignore", RuntimeWarning)
+
+def pytest_configure(config):
+    # fishhook and numpy are optional; the warnings about them missing aren't what's under test
+    config.addinivalue_line("filterwarnings", "ignore::RuntimeWarning")
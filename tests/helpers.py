@@ -0,0 +1,15 @@
+import ast
+import itertools
+from lang.parser import Parser
+from lang.translator import Translator
+from lang.runtime import import_module_from_radon_string
+
+_names = itertools.count(1)
+
+def translate(source: str) -> ast.Module:
+    return Translator().run(Parser(source).run())
+
+def run(source: str):
+    "Runs Radon source as a fresh module and returns it"
+    name = f"radon_test_{next(_names)}"
+    return import_module_from_radon_string(name, source, f"<{name}>")
@@ -0,0 +1,24 @@
+import dis
+import inspect
+from helpers import run
+
+SOURCE = """
+fn h(xs, **kw) @bindglobals
+    n = len(xs);
+    (n, kw);
+end
+"""
+
+def test_globals_load_fast():
+    module = run(SOURCE)
+    assert not any(i.opname == "LOAD_GLOBAL" for i in dis.get_instructions(module.h))
+    assert module.h([1, 2]) == (2, {})
+
+def test_signature_is_unchanged_for_callers():
+    module = run(SOURCE)
+    assert module.h([1], len=5) == (1, {"len": 5})
+    assert "len" not in inspect.signature(module.h).parameters
+
+def test_nested_fn_still_sees_globals():
+    module = run("fn f(xs) @bindglobals\n    g = lambda(x) len(x); end;\n    g(xs) + len(xs);\nend")
+    assert module.f([1, 2]) == 4
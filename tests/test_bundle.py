@@ -0,0 +1,20 @@
+import os
+import subprocess
+import sys
+from lang.bundle import build_bundle
+
+def test_bundle_runs_without_the_parser(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    src.mkdir()
+    monkeypatch.chdir(src)
+    (src / "helper.rad").write_text("fn greet(name) f\"hi {name}\"; end\n")
+    (src / "main.rad").write_text("import sys;\nimport helper;\nprint(helper.greet('bundle'));\nprint(sys.modules.get('lang.parser'));\n")
+    output = tmp_path / "app.pyz"
+    modules = build_bundle("main.rad", str(output))
+    assert set(modules) == {"__main__", "helper"}
+
+    # run from elsewhere, with nothing but the bundle to import from
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONPATH"}
+    result = subprocess.run([sys.executable, "-W", "ignore", str(output)], cwd=tmp_path, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines() == ["hi bundle", "None"]
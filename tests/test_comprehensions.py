@@ -0,0 +1,19 @@
+from helpers import run
+
+def test_comprehensions():
+    module = run("xs = [1, 2, 3, 4];\na = [x * 2 for x in xs if x % 2 == 0];\nb = {x % 2 for x in xs};\nc = {str(x): x for x in xs};\nd = sum(x for x in xs);")
+    assert (module.a, module.b, module.c, module.d) == ([4, 8], {0, 1}, {"1": 1, "2": 2, "3": 3, "4": 4}, 10)
+
+def test_nested_generators():
+    assert run("v = [(x, y) for x in range(2) for y in range(x + 1)];").v == [(0, 0), (1, 0), (1, 1)]
+
+def test_lambda_uses_comprehension_variable():
+    module = run("fs = [lambda() i * 10; end for i in range(3)];\nv = [f() for f in fs];")
+    assert module.v == [0, 10, 20]
+
+def test_lambda_in_nested_comprehension_in_fn():
+    module = run("fn f(k)\n    gs = [lambda(x) x + i + j + k; end for i in range(2) for j in [10]];\n    [g(100) for g in gs];\nend\nv = f(1000);")
+    assert module.v == [1110, 1111]
+
+def test_lambda_default_uses_comprehension_variable():
+    assert run("fs = [lambda(x=i) x; end for i in range(2)];\nv = [f() for f in fs];").v == [0, 1]
@@ -0,0 +1,29 @@
+import ast
+import dis
+import pytest
+from helpers import run, translate
+from lang.errors import RadonSyntaxError
+
+def test_const_is_inlined():
+    tree = translate("const N = 2 * 3;\nfn f() N + 1; end")
+    fn = tree.body[1]
+    assert isinstance(fn.body[0].value.left, ast.Constant) and fn.body[0].value.left.value == 6
+
+def test_comprehension_target_shadows_const():
+    assert run("const N = 5;\nv = [N for N in [1, 2]];").v == [1, 2]
+
+def test_class_body_binding_shadows_const():
+    module = run("const N = 5;\nclass C\n    N = 1;\n    v = N;\n    fn get(self) N; end\nend")
+    assert module.C.v == 1
+    assert module.C().get() == 5
+
+def test_parameter_shadows_const():
+    assert run("const N = 5;\nfn f(N) N; end\nv = f(1);").v == 1
+
+def test_dead_branch_is_removed():
+    module = run("const DEBUG = !True;\nfn f()\n    if DEBUG then\n        print('debug');\n    end\n    1;\nend")
+    assert not any(i.argval == "print" for i in dis.get_instructions(module.f))
+
+def test_const_cannot_be_reassigned():
+    with pytest.raises(RadonSyntaxError):
+        translate("const N = 1;\nN = 2;")
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+import pytest
+from helpers import run
+from lang.errors import RadonSyntaxError
+from lang.parser import Parser
+
+BAD = "x = ;\ny = 1;\nz = (;\nw = 2;\n"
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_every_error_is_collected():
+    with pytest.raises(RadonSyntaxError) as info:
+        Parser(BAD).run()
+    assert [e.lineno for e in info.value.errors] == [1, 3]
+    assert info.value.errors[0] is info.value
+
+def test_filename_is_set_on_every_error():
+    with pytest.raises(RadonSyntaxError) as info:
+        run(BAD)
+    assert {e.filename for e in info.value.errors} == {info.value.filename}
+
+def test_errors_are_reported_under_optimize(tmp_path):
+    (tmp_path / "bad.rad").write_text(BAD)
+    result = subprocess.run([sys.executable, "-O", "-W", "ignore", os.path.join(ROOT, "radon.py"), "bad.rad"], cwd=tmp_path, capture_output=True, text=True)
+    assert result.returncode == 1
+    assert result.stderr.count("SyntaxError:") == 2
+    assert "line 1" in result.stderr and "line 3" in result.stderr
@@ -0,0 +1,31 @@
+import ast
+import pytest
+from helpers import run, translate
+from lang.errors import RadonSyntaxError
+
+def test_compiles_to_joined_str():
+    value = translate('v = f"a{1 + 2}b";').body[0].value
+    assert isinstance(value, ast.JoinedStr)
+
+def test_interpolation_and_escaped_braces():
+    assert run('x = 4;\nv = f"{{x}} = {x * 2}";').v == "{x} = 8"
+
+def test_conversions():
+    assert run("s = 'hi';\nv = f\"{s!r} {s!s} {'é'!a}\";").v == "'hi' hi '\\xe9'"
+
+def test_format_spec():
+    assert run('x = 3.14159;\nv = f"{x:.2f}|{42:>5}|{255:x}";').v == "3.14|   42|ff"
+
+def test_nested_format_spec():
+    assert run('x = 3.14159;\nw = 8;\np = 3;\nv = f"{x:>{w}.{p}f}";').v == "   3.142"
+
+def test_conversion_with_spec():
+    assert run("s = 'a';\nv = f\"{s!r:>5}\";").v == "  'a'"
+
+def test_invalid_conversion():
+    with pytest.raises(RadonSyntaxError):
+        translate('v = f"{1!z}";')
+
+def test_empty_expression():
+    with pytest.raises(RadonSyntaxError):
+        translate('v = f"{}";')
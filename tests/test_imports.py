@@ -0,0 +1,62 @@
+import asyncio
+import builtins
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from helpers import run
+from lang import bootstrap, runtime
+
+AWAITING = "import asyncio;\nawait asyncio.sleep(0);\nvalue = 1;\n"
+
+def test_module_importing_awaiting_module_runs_on_the_loop(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "awaiting.rad").write_text(AWAITING)
+    (tmp_path / "middle.rad").write_text("import awaiting;\nvalue = awaiting.value + 1;\n")
+    module = run("import asyncio;\nawait asyncio.sleep(0);\nimport middle;\nv = middle.value;")
+    assert module.v == 2
+
+def test_sync_module_importing_awaiting_module(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "awaiting.rad").write_text(AWAITING)
+    (tmp_path / "middle.rad").write_text("import awaiting;\nvalue = awaiting.value + 1;\n")
+    assert run("import middle;\nv = middle.value;").v == 2
+
+def test_import_in_async_fn(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "awaiting.rad").write_text(AWAITING)
+    module = run("fn load() @async\n    import awaiting;\n    awaiting.value;\nend")
+    assert asyncio.run(module.load()) == 1
+
+def test_concurrent_imports_run_the_module_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(builtins, "radon_test_hits", [], raising=False)
+    (tmp_path / "slow_module.rad").write_text("import time;\ntime.sleep(0.05);\nradon_test_hits.append(1);\n")
+    barrier = threading.Barrier(4)
+    def load(_):
+        barrier.wait()
+        return runtime.import_module_generic(["slow_module"], None)
+    try:
+        with ThreadPoolExecutor(4) as pool:
+            modules = list(pool.map(load, range(4)))
+    finally:
+        sys.modules.pop("slow_module", None)
+    assert builtins.radon_test_hits == [1]
+    assert all(m is modules[0] for m in modules)
+    assert not hasattr(runtime, "slow_module")
+
+def test_import_cycle_gets_partly_run_module(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "cycle_a.rad").write_text("first = 1;\nimport cycle_b;\n")
+    (tmp_path / "cycle_b.rad").write_text("import cycle_a;\nseen = cycle_a.first;\n")
+    try:
+        assert runtime.import_module_generic(["cycle_a"], None).cycle_b.seen == 1
+    finally:
+        sys.modules.pop("cycle_a", None)
+        sys.modules.pop("cycle_b", None)
+
+def test_shared_loop_refuses_other_threads():
+    bootstrap.get_loop()
+    with ThreadPoolExecutor(1) as pool:
+        with pytest.raises(RuntimeError):
+            pool.submit(bootstrap.get_loop).result()
@@ -0,0 +1,32 @@
+import ast
+from helpers import run, translate
+
+def test_inline_body_is_substituted():
+    module = run("fn sq(x) @inline x * x; end\nv = sq(3) + sq(4);")
+    assert module.v == 25
+    tree = translate("fn sq(x) @inline x * x; end\nv = sq(3);")
+    assert not any(isinstance(n, ast.Call) and getattr(n.func, "id", None) == "sq" for n in ast.walk(tree))
+
+def test_global_shadowed_by_comprehension_target_is_not_inlined():
+    module = run("y = 100;\nfn addy(a) @inline a + y; end\nv = [addy(1) for y in [1, 2]];")
+    assert module.v == [101, 101]
+
+def test_global_shadowed_by_class_body_is_not_inlined():
+    module = run("y = 100;\nfn addy(a) @inline a + y; end\nclass C\n    y = 1;\n    v = addy(1);\nend")
+    assert module.C.v == 101
+
+def test_global_shadowed_through_nested_inline_fn():
+    module = run("y = 100;\nfn gety() @inline y; end\nfn addy(a) @inline a + gety(); end\nfn f(y) addy(1); end\nv = f(5);")
+    assert module.v == 101
+
+def test_comprehension_rebinding_a_parameter():
+    module = run("fn f(x) @inline list([x * 2 for x in range(3)]); end\nv = f(5);")
+    assert module.v == [0, 2, 4]
+
+def test_argument_is_not_captured_by_comprehension_target():
+    module = run("fn f(x) @inline sum([x + y for y in range(3)]); end\ny = 10;\nv = f(y);")
+    assert module.v == 33
+
+def test_argument_is_not_captured_through_nested_inline_fn():
+    module = run("fn g(z) @inline sum([z + y for y in range(3)]); end\nfn f(x) @inline g(x); end\ny = 10;\nv = f(y);")
+    assert module.v == 33
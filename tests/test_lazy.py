@@ -0,0 +1,20 @@
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from lang.bootstrap import LazyModule
+
+def test_lazy_module_loads_once_across_threads():
+    loads = []
+    def importer(names, as_name):
+        loads.append(names)
+        time.sleep(0.05) # long enough for the other threads to arrive while it's loading
+        return types.SimpleNamespace(value=len(loads))
+    lazy = LazyModule(importer, ["slow"], None)
+    barrier = threading.Barrier(4)
+    def read(_):
+        barrier.wait()
+        return lazy.value
+    with ThreadPoolExecutor(4) as pool:
+        assert list(pool.map(read, range(4))) == [1] * 4
+    assert len(loads) == 1
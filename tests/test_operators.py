@@ -0,0 +1,44 @@
+import ast
+import pytest
+from helpers import run, translate
+from lang.errors import RadonSyntaxError
+from lang.nodes import NodeBinOp, NodeUnaryOp, UnaryOp, BinOp
+from lang.parser import Parser
+
+def expr(source: str):
+    return Parser(source + ";").run()[0].node
+
+def test_unary_parses_below_binary_operators():
+    tree = expr("-a * b")
+    assert isinstance(tree, NodeBinOp) and tree.op == BinOp.MUL
+    assert isinstance(tree.left, NodeUnaryOp) and tree.left.op == UnaryOp.NEG
+
+def test_not_binds_tighter_than_comparison():
+    module = run("x = 1;\nv = !x == False;")
+    assert module.v is True
+
+def test_unary_operators_nest():
+    assert run("v = (- -3, +-2, !!1);").v == (3, -2, True)
+
+def test_unary_operators_fold():
+    module = run("const A = -1;\nconst B = !False;\nconst C = +A * -2;\nv = (A, B, C, -A - -1);")
+    assert module.v == (-1, True, 2, 2)
+
+def test_literals_are_constants():
+    tree = translate("v = (True, False, None);")
+    assert [(type(x), x.value) for x in tree.body[0].value.elts] == [(ast.Constant, True), (ast.Constant, False), (ast.Constant, None)]
+
+def test_literals_cannot_be_assigned():
+    with pytest.raises(RadonSyntaxError):
+        translate("True = 1;")
+
+def test_arithmetic_is_left_associative():
+    module = run("a = 7 % 4 * 2;\nb = 100 / 10 % 3;\nc = 10 - 4 - 3;\nd = 2 - 3 + 4;\nn = 8;\nr = 2;\ne = n/r/r;")
+    assert (module.a, module.b, module.c, module.d, module.e) == (6, 1.0, 3, 3, 2.0)
+
+def test_const_folding_matches_runtime():
+    module = run("const A = 7 % 4 * 2;\nconst B = 10 - 4 - 3;\nv = (A, B);")
+    assert module.v == (6, 3)
+
+def test_unary_binds_tighter_than_binary():
+    assert run("x = 3;\nv = -x * 2 - -1;").v == -5
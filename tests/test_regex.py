@@ -0,0 +1,23 @@
+import re
+import pytest
+from helpers import run, translate
+from lang.errors import RadonSyntaxError
+
+def test_regex_literal():
+    module = run('pat = re"(\\d+)-\\"x\\""i;\nv = pat.match(\'12-"X"\').group(1);')
+    assert module.pat.flags & re.IGNORECASE
+    assert module.v == "12"
+
+def test_division_by_r_is_not_a_regex():
+    module = run("r = 2;\nn = 8;\nv = (n/r, r/2, n / r);")
+    assert module.v == (4.0, 1.0, 4.0)
+
+def test_unknown_flag_is_a_syntax_error():
+    with pytest.raises(RadonSyntaxError):
+        run('pat = re"a"q;')
+
+def test_separately_translated_regexes_keep_their_patterns():
+    namespace = {}
+    for source in ('fn first(s) re"a+".match(s) != None; end', 'fn second(s) re"b+".match(s) != None; end'):
+        exec(compile(translate(source), "<repl>", "exec"), namespace)
+    assert namespace["first"]("aa") and namespace["second"]("bb")
@@ -0,0 +1,29 @@
+import ast
+import sys
+from lang import serialize
+from lang.parser import Parser
+from lang.translator import Translator
+
+SOURCE = """
+const N = 3;
+fn f(xs, k=2, *rest, **kw)
+    [x * k + N for x in xs if x != 0];
+end
+v = f([1, 2, 3]) |> len();
+"""
+
+def same_translation(a, b):
+    return ast.dump(Translator().run(a)) == ast.dump(Translator().run(b))
+
+def test_round_trip():
+    tree = Parser(SOURCE).run()
+    assert same_translation(serialize.load(serialize.dump(tree)), tree)
+
+def test_offset_tables_are_little_endian(monkeypatch):
+    tree = Parser(SOURCE).run()
+    data = serialize.dump(tree)
+    # decode the way a big-endian host does; the result must not depend on the native byte order
+    monkeypatch.setattr(sys, "byteorder", "big")
+    reader = serialize.ASTReader(data)
+    assert isinstance(reader.node_offsets, tuple)
+    assert same_translation(reader.tree(), tree)
@@ -0,0 +1,21 @@
+import pytest
+from helpers import run, translate
+from lang.errors import RadonSyntaxError
+
+def test_generated_init():
+    module = run("class P @slots\n    x = 1;\n    y = 2;\nend\np = P(5);\nv = (p.x, p.y);")
+    assert module.v == (5, 2)
+    assert not hasattr(module.p, "__dict__")
+
+def test_user_init_keeps_field_defaults():
+    module = run("class P @slots\n    x = 1;\n    tags = [];\n    fn __init__(self, y)\n        self.y = y + self.x;\n    end\nend\np = P(5);\nv = (p.x, p.y, p.tags);")
+    assert module.v == (1, 6, [])
+    assert not hasattr(module.p, "__dict__")
+
+def test_user_init_taking_only_varargs_keeps_field_defaults():
+    module = run("class P @slots\n    count = 5;\n    fn __init__(*args)\n        args[0].count = args[0].count + len(args);\n    end\nend\nv = P(1, 2).count;")
+    assert module.v == 8
+
+def test_user_init_without_instance_is_an_error():
+    with pytest.raises(RadonSyntaxError):
+        translate("class P @slots\n    count = 5;\n    fn __init__()\n        1;\n    end\nend")
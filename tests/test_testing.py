@@ -0,0 +1,13 @@
+import sys
+from lang import testing
+
+def test_only_radon_modules_are_dropped_between_tests(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+    (tmp_path / "radon_helper.rad").write_text("value = 1;\n")
+    (tmp_path / "test_first.rad").write_text("import colorsys;\nimport radon_helper;\nv = radon_helper.value;\n")
+    (tmp_path / "test_second.rad").write_text("import radon_helper;\nv = radon_helper.value;\n")
+    results = testing.run_tests(testing.discover("."))
+    assert [r.status for r in results] == [testing.PASSED, testing.PASSED]
+    assert "radon_helper" not in sys.modules
+    assert "colorsys" in sys.modules
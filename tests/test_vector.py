@@ -0,0 +1,47 @@
+import pytest
+from lang import vector
+from helpers import run, translate
+from lang.errors import RadonSyntaxError
+from lang.vector import ListArray, array, vectorize
+
+@pytest.fixture(autouse=True)
+def without_numpy(monkeypatch):
+    # the fallback is what's under test, whether or not numpy is installed here
+    monkeypatch.setattr(vector, "numpy", None)
+
+def plain(value):
+    # ListArray's == is elementwise, so compare plain lists
+    return [plain(x) for x in value] if isinstance(value, list) else value
+
+def test_nested_array_broadcasts_scalar():
+    a = array([[1, 2], [3, 4]])
+    assert isinstance(a[0], ListArray)
+    assert plain(a + 1) == [[2, 3], [4, 5]]
+    assert plain(10 - a) == [[9, 8], [7, 6]]
+
+def test_rows_broadcast_like_numpy():
+    assert plain(array([[1, 2], [3, 4]]) + [10, 20]) == [[11, 22], [13, 24]]
+    assert plain([10, 20] * array([[1, 2], [3, 4]])) == [[10, 40], [30, 80]]
+
+def test_mismatched_lengths():
+    with pytest.raises(ValueError):
+        array([1, 2, 3]) + [1, 2]
+
+def test_vectorize_nested():
+    @vectorize
+    def f(x, k):
+        return x * k + 1
+    assert plain(f([[1, 2], [3, 4]], 2)) == [[3, 5], [7, 9]]
+    assert plain(f([1, 2], [3, 4])) == [4, 9]
+
+def test_negation():
+    assert plain(-array([[1, -2], [3, 4]])) == [[-1, 2], [-3, -4]]
+
+def test_vectorize_allows_negation():
+    module = run("fn g(x) @vectorize x * -1 + +x; end\nfn h(x) @vectorize\n    y = -x;\n    y;\nend")
+    assert plain(module.g([1, 2])) == [0, 0]
+    assert plain(module.h([[1, 2]])) == [[-1, -2]]
+
+def test_vectorize_rejects_not():
+    with pytest.raises(RadonSyntaxError):
+        translate("fn g(x) @vectorize !x; end")
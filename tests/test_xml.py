@@ -0,0 +1,30 @@
+import ast
+import io
+from helpers import run, translate
+from lang.xml import iter_render, render, render_string
+
+def test_static_literal_folds_to_one_constant():
+    tree = translate('v = <a href="x"><b>hi</b> there</a>;')
+    value = tree.body[0].value
+    assert isinstance(value, ast.Constant)
+    assert value.value == ("a", (("href", "x"),), ("b", (), "hi"), " there")
+
+def test_dynamic_attribute_keeps_static_parts_constant():
+    tree = translate("n = 3;\nv = <p id=n><i>x</i></p>;")
+    value = tree.body[1].value
+    assert isinstance(value, ast.Tuple)
+    assert isinstance(value.elts[2], ast.Constant)
+    assert run("n = 3;\nv = <p id=n><i>x</i></p>;").v == ("p", (("id", 3),), ("i", (), "x"))
+
+def test_render_escapes_text_and_attributes():
+    tree = ("a", (("title", 'say "hi" & <bye>'),), "1 < 2 & 3 > 2", ("b", {"k": "'"}, '"quoted"'))
+    assert render_string(tree) == '<a title="say &quot;hi&quot; &amp; &lt;bye&gt;">1 &lt; 2 &amp; 3 &gt; 2<b k="&#x27;">"quoted"</b></a>'
+
+def test_render_streams_in_chunks():
+    tree = ("ul", (), *(("li", (), str(i)) for i in range(100)))
+    out = io.StringIO()
+    writes = []
+    out.write = lambda s: writes.append(s)
+    render(tree, out, chunk_size=64)
+    assert len(writes) > 1
+    assert "".join(writes) == "".join(iter_render(tree))